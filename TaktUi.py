@@ -77,17 +77,16 @@ class TaktUI():
 
         # only when output channel active
         if self.conf.hasActiveChannel() or (index == -1):
-            # recalculate divider
-            self.conf = logic.calcDivider(self.conf)
+            # recalculate divider + set register to match configuration
+            # recently used plans are taken from the cache
+            # a single channel change keeps the pll when possible
+            self.conf = self.planCache.calcPlan(self.conf, index)
             for uiChannel in self.channels:
                 # update channel dataset from global dataset
                 uiChannel.channel = self.conf.channels[uiChannel.channel.index]
                 # refresh ui values
                 uiChannel.configUpdate(False)
-            print("new divider ")
-
-            # set register to match configuration
-            self.conf = logic.setRegister(self.conf)
+            print("new divider " + str(self.planCache))
 
             # transmit settings
             self.worker.writeConfig(self.conf)
@@ -204,6 +203,9 @@ class TaktUI():
             logic.Input(1)
             ])
 
+        # solved plans of recent configurations
+        self.planCache = logic.PlanCache()
+
         # generate layout
         self.layout = QHBoxLayout()
         self.channels = [
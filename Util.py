@@ -1,21 +1,11 @@
 import logic.Constants as Constants
 import logic
-import numpy as np
-from threading import Timer
 
 #
 #   Collection of multiple utility functions
 #   Used from different classes, always without context (static)
 #
 
-#
-#   Timer run code repeatly
-#   Used in worker
-class RepeatTimer(Timer):
-    def run(self):
-        while not self.finished.wait(self.interval):
-            self.function(*self.args, **self.kwargs)
-
 #
 #   Style text with HTML tags
 #
@@ -104,26 +94,3 @@ def printFormat(conf, index):
     #out = out + sig.stopHigh
     return out
 
-
-#
-#   Calculates efficiently the largest common multiple
-#   Scales float numbers up to ints and uses the numpy lcm
-def floatLCMNP(values):
-    if len(values) == 1:
-        return values[0]
-    power = max(map(lambda v: abs(str(v)[::-1].find('.')), values))
-    ints = [int(v*10**power) for v in values]
-    return float(np.lcm.reduce(ints).item())/10**power
-
-
-#
-#   Calculates the gcd of two numbers with a
-#   certain maximum error (for floats)
-def floatGcd(a,b):
-    r = 0
-    while (a%b > logic.Constants.GCD_INPUT_ERROR):
-        r = a%b
-        a=b
-        b=r
-
-    return b
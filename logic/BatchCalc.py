@@ -0,0 +1,338 @@
+#!/bin/python3
+import logic
+import numpy as np
+import math
+import logic.DividerCalc as DividerCalc
+import logic.FvcoSearch as FvcoSearch
+import logic.FreqMath as FreqMath
+import logic.PfdSearch as PfdSearch
+import logic.PlanDatabase as PlanDatabase
+
+#
+#   Vectorized divider calculation for many channel plans at once
+#   Used offline to check candidate frequency plans before a board
+#   configuration is shipped. Every step mirrors the single plan calculation
+#   in "DividerCalc" (plan database lookup, findFPLL, calcChannelDivider,
+#   inputConfigurationMulti), which is the reference for this batch engine.
+#
+#   frequencies:    (N plans x 4 channels) output frequencies, 0 --> channel disabled
+#   inputs:         (N plans x 2 inputs) or (2,) input frequencies, 0 --> input disabled
+#
+
+
+# per plan result
+PLAN_DTYPE = np.dtype([
+    ("fvco", np.float64),
+    ("Mxaxb_N", np.float64),
+    ("Mxaxb_D", np.int64),
+    ("Fpfd", np.float64),
+    ("MN", np.int64),
+    ("MD", np.int64),
+])
+
+# per channel result
+CHANNEL_DTYPE = np.dtype([
+    ("NN", np.int64),
+    ("ND", np.int64),
+    ("R", np.int64),
+    ("N", np.int64),
+    ("realFrequency", np.float64),
+])
+
+# per input result
+INPUT_DTYPE = np.dtype([
+    ("PN", np.int64),
+    ("PD", np.int64),
+])
+
+
+# element wise helpers on object arrays
+toFractionArray = np.frompyfunc(FreqMath.toFraction, 1, 1)
+numeratorArray = np.frompyfunc(lambda f: f.numerator, 1, 1)
+denominatorArray = np.frompyfunc(lambda f: f.denominator, 1, 1)
+
+
+#
+#   Least common multiple of all enabled (2*f) per plan
+#   exact rational lcm: lcm(numerators) / gcd(denominators), see FreqMath.lcm
+def lcmBatch(frequencies2, enabled):
+    fractions = toFractionArray(np.where(enabled, frequencies2, 1.0).astype(object))
+    num = np.where(enabled, numeratorArray(fractions), 1).astype(object)
+    den = np.where(enabled, denominatorArray(fractions), 0).astype(object)
+    return (np.lcm.reduce(num, axis=1) / np.gcd.reduce(den, axis=1)).astype(np.float64)
+
+
+#
+#   Fvco per plan, see DividerCalc.findFPLL
+#
+def findFPLLBatch(frequencies2, enabled):
+    maxF = float(logic.Constants.MAX_PLL_F)
+    lcm = lcmBatch(frequencies2, enabled)
+    targetFvco = np.where(lcm <= maxF, lcm, np.max(np.where(enabled, frequencies2, 0.0), axis=1))
+
+    fvco = np.floor(maxF/targetFvco)*targetFvco
+
+    # to low Fvco --> search in the vco band (per plan)
+    for n in np.flatnonzero(fvco < logic.Constants.MIN_PLL_F):
+        fvco[n] = FvcoSearch.searchFvco(list(frequencies2[n][enabled[n]]/2), 1)[0].fvco
+    return fvco
+
+
+#
+#   bit length of integer valued arrays (exact below 2**53), 0 for 0
+#
+def bitLengthBatch(values):
+    return np.frexp(values.astype(np.float64))[1].astype(np.int64)
+
+
+#
+#   N divider limit, closed form N / R split, see BitWidth.splitNR
+#   all arrays are modified where mask is set
+def capNdividerBatch(NN, ND, R, mask):
+    NNi = np.where(mask, NN, 0).astype(np.int64)
+    NDi = np.where(mask, ND, 1).astype(np.int64)
+    limit = NDi << logic.Constants.NN_MAX_VAL_PWR
+    cap = mask & (NNi > limit)
+    if not np.any(cap):
+        return NN, ND, R
+
+    # smallest k with NN <= limit * 2**k
+    k = bitLengthBatch(-((-NNi) // limit) - 1)
+
+    # scale up: k - trailing zeros of NN makes NN / 2**k integer
+    zeros = bitLengthBatch(NNi & -NNi) - 1
+    j = np.maximum(0, np.minimum.reduce([
+        k - zeros,
+        logic.Constants.NN_MAX_PWR + k - bitLengthBatch(NNi),
+        logic.Constants.ND_MAX_PWR - bitLengthBatch(NDi)
+        ]))
+
+    # (NN << j) >> k == NN >> (k - j), j <= k
+    NN[cap] = (NNi >> (k - j))[cap]
+    ND[cap] = (NDi << j)[cap]
+    R[cap] = (2 << k)[cap]
+    return NN, ND, R
+
+
+#
+#   per channel divider, see DividerCalc.calcChannelDivider
+#
+def calcChannelDividerBatch(fvco, frequencies, enabled):
+    fvcoCh = np.broadcast_to(fvco[:, None], frequencies.shape)
+    divider = fvcoCh / np.where(enabled, frequencies*2, 1.0)
+    integer = enabled & (np.minimum(divider % 1, -divider % 1) <= logic.Constants.FVCO_TO_MULTI_ERROR)
+    fractional = enabled & ~integer
+
+    NN = np.where(integer, np.round(divider), 0.0)
+    ND = np.where(integer, 1.0, 0.0)
+    R = np.where(enabled, 2.0, 0.0)
+
+    # not a multiple --> best rational approximation
+    if np.any(fractional):
+        target = toFractionArray(fvcoCh[fractional].astype(object)) / (toFractionArray(frequencies[fractional].astype(object))*2)
+        best = np.frompyfunc(lambda t: DividerCalc.bestRational(
+            t,
+            2**logic.Constants.NN_MAX_PWR - 1,
+            2**logic.Constants.ND_MAX_PWR - 1
+            )[:2], 1, 1)(target)
+        NN[fractional] = [b[0] for b in best]
+        ND[fractional] = [b[1] for b in best]
+
+    NN, ND, R = capNdividerBatch(NN, ND, R, enabled)
+
+    NN, ND, R = shareMultiSynthBatch(frequencies, enabled, NN, ND, R)
+
+    channels = np.zeros(frequencies.shape, dtype=CHANNEL_DTYPE)
+    channels["NN"] = NN
+    channels["ND"] = ND
+    channels["R"] = R
+    channels["N"] = assignMultiSynthBatch(enabled, NN, ND)
+    channels["realFrequency"] = np.where(enabled, fvcoCh/(np.where(enabled, NN, 1.0)/np.where(enabled, ND, 1.0))/np.where(enabled, R, 1.0), 0.0)
+    return channels
+
+
+#
+#   MultiSynth sharing, see DividerCalc.shareBase
+#   fastest channel first, a channel follows the first base with
+#   f_base / f integer and R_base * m <= 2**R_MAX_PWR
+def shareMultiSynthBatch(frequencies, enabled, NN, ND, R):
+    rows = np.arange(len(frequencies))
+    order = np.argsort(-np.where(enabled, frequencies, 0.0), axis=1, kind="stable")
+    isBase = np.zeros(frequencies.shape, dtype=bool)
+    fractions = toFractionArray(np.where(enabled, frequencies, 1.0).astype(object))
+
+    for k in range(frequencies.shape[1]):
+        c = order[:, k]
+        free = enabled[rows, c].copy()
+        for j in range(k):
+            b = order[:, j]
+            ratio = fractions[rows, b] / fractions[rows, c]
+            m = np.where(denominatorArray(ratio) == 1, numeratorArray(ratio), 0).astype(np.float64)
+            share = free & isBase[rows, b] & (m > 0) & (R[rows, b]*m <= 2**logic.Constants.R_MAX_PWR)
+            NN[rows[share], c[share]] = NN[rows[share], b[share]]
+            ND[rows[share], c[share]] = ND[rows[share], b[share]]
+            R[rows[share], c[share]] = R[rows[share], b[share]] * m[share]
+            free = free & ~share
+        isBase[rows, c] = free
+    return NN, ND, R
+
+
+#
+#   MultiSynth index, see DividerCalc.assignMultiSynth
+#   lowest output index with the same NN / ND, -1 when disabled
+def assignMultiSynthBatch(enabled, NN, ND):
+    N = np.full(NN.shape, -1, dtype=np.int64)
+    for ch in range(NN.shape[1]):
+        N[:, ch] = np.where(enabled[:, ch], ch, -1)
+        for other in range(ch):
+            same = enabled[:, ch] & enabled[:, other] & (NN[:, ch] == NN[:, other]) & (ND[:, ch] == ND[:, other]) & (N[:, ch] == ch)
+            N[same, ch] = N[same, other]
+    return N
+
+
+#
+#   precomputed plans, see PlanDatabase.lookupPlan
+#   plans with a stored plan get its Fvco + channel divider
+#   fvco, Mxaxb_N, Mxaxb_D, channels: arrays of the plans, modified
+def lookupPlanBatch(frequencies, enabled, fvco, Mxaxb_N, Mxaxb_D, channels):
+    if PlanDatabase.connectPlanDatabase() is None:
+        return
+    for n in range(len(frequencies)):
+        plan = PlanDatabase.findPlan(list(frequencies[n][enabled[n]]))
+        if plan is None:
+            continue
+        fvco[n], Mxaxb_N[n], Mxaxb_D[n] = plan.fvco, plan.Mxaxb_N, plan.Mxaxb_D
+        stored = {ch.frequency: ch for ch in plan.channels}
+        for c in range(frequencies.shape[1]):
+            ch = stored.get(float(frequencies[n][c])) if enabled[n][c] else None
+            if ch is None:
+                channels[n][c] = (0, 0, 0, -1, 0.0)
+            else:
+                channels[n][c] = (ch.NN, ch.ND, ch.R, -1, ch.realFrequency)
+        channels["N"][n] = assignMultiSynthBatch(enabled[n:n+1], channels["NN"][n:n+1], channels["ND"][n:n+1])[0]
+
+
+#
+#   MN / MD with maximum left shift, see DividerCalc.calcPhaseDetectorDivider
+#
+def calcPhaseDetectorDividerBatch(fvco, Fpfd, mask):
+    Ftmp = Fpfd * 5
+    fvcoInt = np.ceil(fvco).astype(np.int64).astype(object)
+    ftmpInt = np.ceil(Ftmp).astype(np.int64).astype(object)
+
+    shift = np.ones(fvco.shape, dtype=np.int64)
+    active = mask.copy()
+    for i in range(logic.Constants.MN_MAX_PWR):
+        exceeded = (
+            ((fvcoInt << shift.astype(object)) > 2**logic.Constants.MN_MAX_PWR) |
+            ((ftmpInt << shift.astype(object)) > 2**logic.Constants.MD_MAX_PWR)
+            ).astype(bool)
+        active = active & ~exceeded
+        if not np.any(active):
+            break
+        shift[active] = shift[active] + 1
+
+    shift = shift - 1
+    MN = np.where(mask, np.trunc(fvco * 2.0**shift), 0).astype(np.int64)
+    MD = np.where(mask, np.trunc(Ftmp * 2.0**shift), 0).astype(np.int64)
+    return MN, MD
+
+
+#
+#   input divider, see DividerCalc.inputConfigurationMulti
+#
+def inputConfigurationBatch(plans, inFrequencies):
+    inEnabled = inFrequencies > 0
+    result = np.zeros(inFrequencies.shape, dtype=INPUT_DTYPE)
+    Fpfd = np.zeros(len(plans), dtype=np.float64)
+    anyInput = np.any(inEnabled, axis=1)
+
+    # two inputs --> best common phase detector frequency (per plan)
+    dual = inEnabled[:, 0] & inEnabled[:, 1]
+    for n in np.flatnonzero(dual):
+        candidates = PfdSearch.pfdCandidates(list(inFrequencies[n]), 1)
+        if len(candidates) == 0:
+            dual[n] = False
+            continue
+        Fpfd[n] = float(candidates[0].Fpfd)
+        result["PN"][n] = candidates[0].PN
+        result["PD"][n] = candidates[0].PD
+
+    # single input or fallback
+    single = anyInput & ~dual
+    index = np.where(inEnabled[:, 0], 0, 1)
+    for i in range(2):
+        sel = single & (index == i)
+        result["PN"][sel, i] = np.ceil(inFrequencies[sel, i] / logic.Constants.F_PFD_MAX)
+        result["PD"][sel, i] = 1
+        Fpfd[sel] = inFrequencies[sel, i] / result["PN"][sel, i].astype(np.float64)
+
+    plans["MN"], plans["MD"] = calcPhaseDetectorDividerBatch(plans["fvco"], Fpfd, anyInput)
+    plans["Fpfd"] = Fpfd
+    return result
+
+
+#
+#   Main function
+#   returns structured arrays (plans[N], channels[N,4], inputs[N,2])
+#   Plans without enabled channel keep all values zero
+def calcDividerBatch(frequencies, inputs):
+    frequencies = np.atleast_2d(np.asarray(frequencies, dtype=np.float64))
+    inFrequencies = np.broadcast_to(np.asarray(inputs, dtype=np.float64), (len(frequencies), 2))
+    enabled = frequencies > 0
+    active = np.any(enabled, axis=1)
+
+    plans = np.zeros(len(frequencies), dtype=PLAN_DTYPE)
+    channels = np.zeros(frequencies.shape, dtype=CHANNEL_DTYPE)
+    inDivider = np.zeros(inFrequencies.shape, dtype=INPUT_DTYPE)
+    if not np.any(active):
+        return plans, channels, inDivider
+
+    # only plans with at least one enabled channel
+    fvco = findFPLLBatch(frequencies[active]*2, enabled[active])
+    Mxaxb_N = fvco.copy()
+    Mxaxb_D = np.full(len(fvco), logic.Constants.EXTERNAL_REF_FREQ, dtype=np.int64)
+    activeChannels = calcChannelDividerBatch(fvco, frequencies[active], enabled[active])
+    lookupPlanBatch(frequencies[active], enabled[active], fvco, Mxaxb_N, Mxaxb_D, activeChannels)
+
+    plans["fvco"][active] = fvco
+    plans["Mxaxb_N"][active] = Mxaxb_N
+    plans["Mxaxb_D"][active] = Mxaxb_D
+    channels[active] = activeChannels
+
+    activePlans = plans[active]
+    inDivider[active] = inputConfigurationBatch(activePlans, inFrequencies[active])
+    plans[active] = activePlans
+    return plans, channels, inDivider
+
+
+#
+#   Test code when started as stand-alone script
+#   compares the batch engine against the single plan reference calcDivider
+#
+if __name__ == "__main__":
+    import random
+    random.seed(0)
+    choices = [0.0, 100.0, 33.333, 10_000_000.0, 20_000_000.0, 25_000_000.0,
+               100_000_000.0, 156_250_000.0, 161_132_812.5, 720_000_000.0, 1234.5678]
+    inChoices = [0.0, 10_000_000.0, 25_000_000.0, 19_440_000.0, 1_000_000.0]
+    freqs = np.array([[random.choice(choices) for ch in range(4)] for n in range(500)])
+    ins = np.array([[random.choice(inChoices) for i in range(2)] for n in range(500)])
+    plans, channels, inDivider = calcDividerBatch(freqs, ins)
+
+    mismatch = 0
+    for n in range(len(freqs)):
+        conf = logic.Configuration(
+            [logic.OutChannel(ch, freqs[n][ch] if freqs[n][ch] else 1.0, freqs[n][ch] > 0) for ch in range(4)],
+            [logic.Input(i, ins[n][i]) for i in range(2)])
+        for i in range(2):
+            conf.inputs[i].enabled = ins[n][i] > 0
+        conf = DividerCalc.calcDivider(conf)
+        if not any(freqs[n] > 0):
+            continue
+        ref = [conf.fvco, conf.MN, conf.MD] + [x for i in conf.inputs for x in (i.PN, i.PD)] + [x for ch in conf.channels for x in (ch.NN, ch.ND, ch.R, ch.N, ch.realFrequency)]
+        res = [plans[n]["fvco"], plans[n]["MN"], plans[n]["MD"]] + [x for i in inDivider[n] for x in (i["PN"], i["PD"])] + [x for ch in channels[n] for x in (ch["NN"], ch["ND"], ch["R"], ch["N"], ch["realFrequency"])]
+        if ref != res:
+            mismatch = mismatch + 1
+            print("mismatch plan {}: {} {}\n{}\n{}".format(n, freqs[n], ins[n], ref, res))
+    print("{} plans compared, {} mismatches".format(len(freqs), mismatch))
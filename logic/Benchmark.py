@@ -0,0 +1,241 @@
+import logic
+import argparse
+import hashlib
+import json
+import os.path as path
+import random
+import sys
+import time
+import logic.DividerCalc as DividerCalc
+import logic.PlanDatabase as PlanDatabase
+from collections import namedtuple
+
+#
+#   Divider solver benchmark
+#   Runs calcDivider, findBestDivider, capNdivider and calcPhaseDetectorDivider
+#   on a seeded corpus of realistic and adversarial plans, reports the latency
+#   percentiles per function and a checksum over all results.
+#   The report is compared against a stored baseline:
+#   changed checksum --> solver output changed
+#   p50 above baseline * BENCH_TIME_BUDGET --> solver slower
+#
+#   python3 -m logic.Benchmark [--save] [--baseline FILE] [--size N] [--seed S]
+#   record the baseline on the target (Raspberry) with --save
+#
+
+# one corpus plan: kind, output frequencies, input frequencies (0 --> disabled)
+BenchPlan = namedtuple("BenchPlan", ["kind", "outputs", "inputs"])
+
+# result of one function
+BenchResult = namedtuple("BenchResult", ["name", "calls", "p50", "p90", "p99", "max", "checksum"])
+
+PRIMES = [101, 103, 107, 109, 113, 127, 131, 137, 139, 149, 151, 157, 163, 167, 173, 179, 181, 191, 193, 197]
+
+
+#
+#   Seeded corpus
+#   catalogue:  common frequencies (PlanDatabase.CATALOGUE)
+#   coprime:    co-prime frequencies --> huge lcm
+#   subhz:      catalogue frequencies with sub-Hz offsets
+#   max:        720 MHz maximum output frequency with other channels
+#   dual:       catalogue plans locked to two inputs
+def benchCorpus(seed=None, size=None):
+    if seed is None: seed = logic.Constants.BENCH_SEED
+    if size is None: size = logic.Constants.BENCH_SIZE
+    rand = random.Random(seed)
+    catalogue = [f for name, f in PlanDatabase.CATALOGUE]
+    inputs = [10_000_000.0, 25_000_000.0, 19_440_000.0, 156_250_000.0, 1_000_000.0, 27_000_000.0]
+    kinds = ["catalogue", "coprime", "subhz", "max", "dual"]
+
+    corpus = []
+    for n in range(size):
+        kind = kinds[n % len(kinds)]
+        count = rand.randint(1, 4)
+        ins = (0.0, 0.0)
+        if kind == "coprime":
+            outputs = [p * rand.choice([1e3, 1e4, 1e5, 1e6]) for p in rand.sample(PRIMES, count)]
+        elif kind == "subhz":
+            outputs = [f + round(rand.uniform(0.001, 0.999), 3) for f in rand.sample(catalogue, count)]
+        elif kind == "max":
+            outputs = [logic.Constants.OUTPUT_F_MAX_DIFF] + rand.sample(catalogue, count - 1)
+        else:
+            outputs = rand.sample(catalogue, count)
+        if kind == "dual":
+            ins = tuple(rand.sample(inputs, 2))
+        elif rand.random() < 0.5:
+            ins = (rand.choice(inputs), 0.0)
+        corpus.append(BenchPlan(kind, outputs, ins))
+    return corpus
+
+
+#
+#   configuration of a corpus plan
+#
+def benchConfiguration(plan):
+    channels = [logic.OutChannel(i, f, True) for i, f in enumerate(plan.outputs)]
+    channels = channels + [logic.OutChannel(i) for i in range(len(channels), 4)]
+    inputs = [logic.Input(i, f) for i, f in enumerate(plan.inputs)]
+    for input in inputs:
+        input.enabled = input.frequency > 0
+    return logic.Configuration(channels, inputs)
+
+
+#
+#   latency percentile of sorted times
+#
+def percentile(times, p):
+    return times[min(len(times) - 1, int(round(p / 100 * (len(times) - 1))))]
+
+
+#
+#   time calls of one function
+#   calls: list of (prepare, function), prepare creates the fresh arguments
+#   (not timed), result of function goes into the checksum
+def timeCalls(name, calls, repeat):
+    times = []
+    digest = hashlib.sha256()
+    for prepare, function in calls:
+        for r in range(repeat):
+            args = prepare()
+            start = time.perf_counter_ns()
+            result = function(*args)
+            times.append(time.perf_counter_ns() - start)
+        digest.update(repr(result).encode())
+    times.sort()
+    return BenchResult(name, len(times), percentile(times, 50), percentile(times, 90),
+                       percentile(times, 99), times[-1], digest.hexdigest()[:16])
+
+
+#
+#   solved values of a configuration (checksum input)
+#
+def planValues(conf):
+    return (conf.fvco, conf.Mxaxb_N, conf.MN, conf.MD, conf.Fpfd,
+            [(i.PN, i.PD) for i in conf.inputs],
+            [(ch.NN, ch.ND, ch.R, ch.realFrequency) for ch in conf.channels])
+
+
+#
+#   run the benchmark, returns list of BenchResult
+#   the plan database is disabled --> the solver is measured
+def runBenchmark(corpus, repeat=None):
+    if repeat is None: repeat = logic.Constants.BENCH_REPEAT
+    with PlanDatabase.disabledPlanDatabase():
+        return measure(corpus, repeat)
+
+
+#
+#   timings of runBenchmark
+#
+def measure(corpus, repeat):
+    # solved plans as input for the single functions
+    solved = [DividerCalc.calcDivider(benchConfiguration(plan)) for plan in corpus]
+    channels = [(conf.fvco, ch.frequency) for conf in solved for ch in conf.channels if ch.enabled]
+
+    # channel before capNdivider: NN / ND as in channelDivider, R = 2
+    uncapped = []
+    for fvco, frequency in channels:
+        if DividerCalc.fvcoServes(fvco, frequency):
+            uncapped.append((int(round(fvco/(frequency*2))), 1))
+        else:
+            best = DividerCalc.findBestDivider(fvco, frequency)
+            if best is not None:
+                uncapped.append(best[:2])
+
+    def newChannel(NN, ND):
+        channel = logic.OutChannel(0, 0.0, True)
+        channel.NN, channel.ND, channel.R = NN, ND, 2
+        return (channel,)
+
+    def newPfd(conf):
+        pfd = logic.Configuration([], [])
+        pfd.fvco, pfd.Fpfd = conf.fvco, conf.Fpfd
+        return (pfd,)
+
+    results = [
+        timeCalls("calcDivider",
+                  [(lambda plan=plan: (benchConfiguration(plan),),
+                    lambda conf: planValues(DividerCalc.calcDivider(conf))) for plan in corpus], repeat),
+        timeCalls("findBestDivider",
+                  [(lambda args=args: args, DividerCalc.findBestDivider) for args in channels], repeat),
+        timeCalls("capNdivider",
+                  [(lambda NN=NN, ND=ND: newChannel(NN, ND),
+                    lambda channel: (DividerCalc.capNdivider(channel).NN, channel.ND, channel.R)) for NN, ND in uncapped], repeat),
+        timeCalls("calcPhaseDetectorDivider",
+                  [(lambda conf=conf: newPfd(conf),
+                    lambda pfd: (DividerCalc.calcPhaseDetectorDivider(pfd).MN, pfd.MD)) for conf in solved if conf.Fpfd > 0], repeat),
+    ]
+    return results
+
+
+#
+#   baseline file, None --> BENCH_BASELINE_FILE relative to the logic package
+#
+def baselineFile(file=None):
+    if file is None:
+        file = path.join(path.dirname(__file__), logic.Constants.BENCH_BASELINE_FILE)
+    return path.normpath(file)
+
+
+#
+#   report as dictionary (baseline file format)
+#
+def benchReport(results, seed, size):
+    return {
+        "seed": seed,
+        "size": size,
+        "functions": {r.name: r._asdict() for r in results}
+    }
+
+
+#
+#   compare results with the baseline report
+#   returns list of regression messages, empty --> no regression
+def compareBaseline(results, baseline, seed, size):
+    if baseline["seed"] != seed or baseline["size"] != size:
+        return ["baseline corpus differs (seed {}, size {})".format(baseline["seed"], baseline["size"])]
+    regressions = []
+    for r in results:
+        base = baseline["functions"].get(r.name)
+        if base is None:
+            continue
+        if r.checksum != base["checksum"]:
+            regressions.append("{}: output changed (checksum {} != {})".format(r.name, r.checksum, base["checksum"]))
+        if r.p50 > base["p50"] * logic.Constants.BENCH_TIME_BUDGET:
+            regressions.append("{}: slower, p50 {:.1f} us > {:.1f} us".format(r.name, r.p50/1e3, base["p50"]/1e3))
+    return regressions
+
+
+#
+#   command line interface
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Divider solver benchmark")
+    parser.add_argument("--seed", type=int, default=logic.Constants.BENCH_SEED)
+    parser.add_argument("--size", type=int, default=logic.Constants.BENCH_SIZE, help="number of corpus plans")
+    parser.add_argument("--repeat", type=int, default=logic.Constants.BENCH_REPEAT, help="calls per corpus entry")
+    parser.add_argument("--baseline", help="baseline file (default: BENCH_BASELINE_FILE)")
+    parser.add_argument("--save", action="store_true", help="store the results as new baseline")
+    args = parser.parse_args()
+    args.baseline = baselineFile(args.baseline)
+
+    results = runBenchmark(benchCorpus(args.seed, args.size), args.repeat)
+    print("{:26s} {:>7s} {:>10s} {:>10s} {:>10s} {:>10s}  {}".format("function", "calls", "p50 us", "p90 us", "p99 us", "max us", "checksum"))
+    for r in results:
+        print("{:26s} {:7d} {:10.1f} {:10.1f} {:10.1f} {:10.1f}  {}".format(
+            r.name, r.calls, r.p50/1e3, r.p90/1e3, r.p99/1e3, r.max/1e3, r.checksum))
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(benchReport(results, args.seed, args.size), f, indent=2)
+        print("baseline saved: " + args.baseline)
+    elif path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compareBaseline(results, json.load(f), args.seed, args.size)
+        for message in regressions:
+            print("REGRESSION " + message)
+        if len(regressions) == 0:
+            print("no regression against " + args.baseline)
+        sys.exit(1 if len(regressions) else 0)
+    else:
+        print("no baseline " + args.baseline + " (create with --save)")
@@ -0,0 +1,154 @@
+import logic
+
+#
+#   Closed form bit width normalization
+#   Shift amounts and N / R splits of the divider registers calculated with
+#   int.bit_length() instead of step by step loops:
+#   - value << s fits maxPwr bits         <=> s <= maxPwr - bit_length(value)
+#   - value << s <= 2**maxPwr              <=> s <= maxPwr - bit_length(value-1)
+#   Used by leftShiftMax (SetRegister), calcPhaseDetectorDivider and
+#   capNdivider (DividerCalc). The equivalence with the former loops is
+#   checked when started as stand-alone script
+#
+
+
+#
+#   largest shift s with (value << s) < 2**maxPwr (value fits maxPwr bits)
+#   negative when value already exceeds, None when value <= 0 (any shift fits)
+def shiftToWidth(value, maxPwr):
+    if value <= 0:
+        return None
+    return maxPwr - value.bit_length()
+
+
+#
+#   largest shift s with (value << s) <= 2**maxPwr
+#   None when value <= 0 (any shift fits)
+def shiftToPower(value, maxPwr):
+    if value <= 0:
+        return None
+    return maxPwr - (value - 1).bit_length()
+
+
+#
+#   common shift of several values: smallest shift, clamped to [low, high]
+#   None entries (values without limit) are ignored
+def commonShift(shifts, low, high):
+    return max(low, min([s for s in shifts if s is not None] + [high]))
+
+
+#
+#   N / R split of an output divider NN / ND (R = 2)
+#   The MultiSynth divides maximum by 2**NN_MAX_VAL_PWR
+#   --> NN is divided by 2**k and R = 2 << k with the smallest k where
+#       NN / 2**k <= ND * 2**NN_MAX_VAL_PWR
+#   A broken NN / 2**k is scaled up (NN and ND) by 2**j until it is integer
+#   or NN / ND would exceed NN_MAX_PWR / ND_MAX_PWR, the rest is truncated
+#   returns (NN, ND, R), None when no split is needed
+def splitNR(NN, ND):
+    limit = ND << logic.Constants.NN_MAX_VAL_PWR
+    if NN <= limit:
+        return None
+
+    # smallest k with NN <= limit * 2**k
+    k = (-(-NN // limit) - 1).bit_length()
+
+    # scale up: k - trailing zeros of NN makes NN / 2**k integer
+    zeros = (NN & -NN).bit_length() - 1
+    j = max(0, min(
+        k - zeros,
+        shiftToWidth(NN, logic.Constants.NN_MAX_PWR + k),
+        shiftToWidth(ND, logic.Constants.ND_MAX_PWR)
+        ))
+    return ((NN << j) >> k, ND << j, 2 << k)
+
+
+#
+#   Test code when started as stand-alone script
+#   compares the closed forms with the former loop implementations
+#
+if __name__ == "__main__":
+    import math
+    import random
+
+    # former SetRegister.leftShiftMax
+    def leftShiftMaxLoop(num, den, maxPwrNum, maxPwrDen):
+        num = int(round(num))
+        den = int(round(den))
+        for i in range(min(maxPwrNum, maxPwrDen)):
+            if ((num << i) > (2**maxPwrNum-1)):
+                return i-1
+            if ((den << i) > (2**maxPwrDen-1)):
+                return i-1
+        return min(maxPwrNum, maxPwrDen)-1
+
+    # former shift loop of DividerCalc.calcPhaseDetectorDivider
+    def pfdShiftLoop(fvco, Ftmp):
+        shift = 1
+        for i in range(logic.Constants.MN_MAX_PWR):
+            if (
+                ((math.ceil(fvco) << shift) > 2**logic.Constants.MN_MAX_PWR) or
+                ((math.ceil(Ftmp) << shift) > 2**logic.Constants.MD_MAX_PWR)
+                ):
+                break
+            else:
+                shift = shift + 1
+        return shift - 1
+
+    # former DividerCalc.capNdivider
+    def capNdividerLoop(NN, ND):
+        R = 2
+        if ((ND / NN) < (1/(2**logic.Constants.NN_MAX_VAL_PWR))):
+            R = 2
+            while ((ND / NN) < (1/(2**logic.Constants.NN_MAX_VAL_PWR))):
+                NN = NN / 2
+                R = R * 2
+            tmpNN = NN
+            tmpND = ND
+            while ((NN % 1) != 0 and
+                    tmpNN < 2**logic.Constants.NN_MAX_PWR and
+                    tmpND < 2**logic.Constants.ND_MAX_PWR):
+                NN = tmpNN
+                ND = tmpND
+                tmpND = tmpND * 2
+                tmpNN = tmpNN * 2
+            return (int(NN), int(ND), int(R))
+        return None
+
+    random.seed(1)
+    count, mismatch = 0, 0
+    def check(name, expected, result, args):
+        global count, mismatch
+        count = count + 1
+        if expected != result:
+            mismatch = mismatch + 1
+            print("mismatch {} {}: {} != {}".format(name, args, expected, result))
+
+    def leftShiftMax(num, den, maxPwrNum, maxPwrDen):
+        return commonShift([
+            shiftToWidth(int(round(num)), maxPwrNum),
+            shiftToWidth(int(round(den)), maxPwrDen)
+            ], -1, min(maxPwrNum, maxPwrDen) - 1)
+
+    def pfdShift(fvco, Ftmp):
+        return commonShift([
+            shiftToPower(math.ceil(fvco), logic.Constants.MN_MAX_PWR),
+            shiftToPower(math.ceil(Ftmp), logic.Constants.MD_MAX_PWR)
+            ], 0, logic.Constants.MN_MAX_PWR)
+
+    for n in range(20000):
+        bits = random.randint(0, 60)
+        num = random.choice([0, 1, 2**bits, 2**bits - 1, random.getrandbits(bits)])
+        den = random.choice([0, 1, 2**random.randint(0, 40), random.getrandbits(random.randint(0, 40))])
+        pwr = random.choice([(44, 32), (56, 32), (48, 32), (random.randint(1, 60), random.randint(1, 60))])
+        check("leftShiftMax", leftShiftMaxLoop(num, den, *pwr), leftShiftMax(num, den, *pwr), (num, den, pwr))
+
+        fvco = random.choice([0.0, random.uniform(1e9, 14e9), float(2**random.randint(0, 60)), random.uniform(0, 2**60)])
+        Ftmp = random.choice([0.0, random.uniform(1e5, 1e7), float(2**random.randint(0, 40)), random.uniform(0, 2**40)])
+        check("pfdShift", pfdShiftLoop(fvco, Ftmp), pfdShift(fvco, Ftmp), (fvco, Ftmp))
+
+        NN = random.choice([random.getrandbits(random.randint(1, 44)), 2**random.randint(0, 43), random.randint(1, 10**8)]) or 1
+        ND = random.choice([1, 1, random.getrandbits(random.randint(1, 32)), 2**random.randint(0, 31)]) or 1
+        check("capNdivider", capNdividerLoop(NN, ND), splitNR(NN, ND), (NN, ND))
+
+    print("{} cases compared, {} mismatches".format(count, mismatch))
@@ -69,6 +69,7 @@ class OutChannel:
     enabled = False     # enabled flag
 
     NN, ND, R = 0,0,0       # output channel path divider
+    N = -1              # used MultiSynth (N divider) index, -1 --> none
     realFrequency = 0.0 # real calculated output frequency
 
     def __init__(self, index, frequency=0.0, enabled=False, signal=SignalFormat(SignalType.LVDS, DisabledState.STOP_LOW, 0)):
@@ -78,8 +79,8 @@ class OutChannel:
         self.signal = signal
 
     def __str__(self):
-        return "Output channel: index {}, frequency: {}, enabled {}, NN {}, ND {}, R {}, realFrequency {}, signal: {}".format(
-            self.index, self.frequency, self.enabled, self.NN, self.ND, self.R, self.realFrequency, self.signal
+        return "Output channel: index {}, frequency: {}, enabled {}, NN {}, ND {}, R {}, N {}, realFrequency {}, signal: {}".format(
+            self.index, self.frequency, self.enabled, self.NN, self.ND, self.R, self.N, self.realFrequency, self.signal
         )
 
 #
@@ -103,6 +104,21 @@ class Input:
             self.index, self.format, self.frequency, self.PN, self.PD
         )
 
+#
+#   parts of the plan changed by the last divider calculation
+#   pll: Fvco, M, Mxaxb or input divider changed --> full PLL reprogram
+#   channels: indices of the output channels to update
+class PlanChange:
+    pll = True          # pll reprogram needed
+    channels = set()    # changed output channels
+
+    def __init__(self, pll=True, channels=()):
+        self.pll = pll
+        self.channels = set(channels)
+
+    def __str__(self):
+        return "PlanChange: pll {}, channels {}".format(self.pll, sorted(self.channels))
+
 #
 #   holds complete input / output configuration
 #
@@ -114,6 +130,8 @@ class Configuration:
     fvco = 0                # current pll frequency
     Fpfd = 0                # phase detector frequency
     regMap = None           # Register addresses + values
+    transferList = None     # compiled register transfer list of regMap
+    dirty = None            # PlanChange of the last divider calculation
     vddo = SignalVoltage.V1P8
 
     def __init__(self, channels, inputs):
@@ -8,6 +8,24 @@ class Constants:
     # configuration file
     CONFIG_FILE = "../last.tgconfig"
 
+    # precomputed plan database (build: python3 -m logic.PlanDatabase)
+    # relative to the logic package, "" --> no plan database
+    PLAN_DB_FILE = "plans.sqlite"
+
+    # register definition of the part and directory of the compiled
+    # definitions (keyed by file hash), both relative to the logic package
+    REGISTER_FILE = "Si5394Registers.csv"
+    REGISTER_CACHE_DIR = "__pycache__"
+
+    # register descriptions (relative to the logic package), only loaded for
+    # the string representation of the register map
+    REGISTER_DESC_FILE = "Si5394Descriptions.csv"
+
+    # status poll interval in s (fallback to the INTR / LOL / LOS pins)
+    # fast while unlocked, doubled per quiet poll up to slow while locked
+    STATUS_POLL_FAST = 0.5
+    STATUS_POLL_SLOW = 60.0
+
 
     #
     #   UI options
@@ -52,6 +70,8 @@ class Constants:
 
     # maximum internal frequency 14 GHz (f_vco)
     MAX_PLL_F = 14_000_000_000
+    # lowest used internal frequency (95% of MAX_PLL_F)
+    MIN_PLL_F = 13_300_000_000
 
     # divider max values
     NN_MAX_PWR = 44
@@ -76,3 +96,37 @@ class Constants:
 
     F_PFD_MAX = 2_000_000   # maximum phase detector frequency
     F_PFD_MIN = 20_000      # minimum phase detector frequency
+
+    #
+    #   Fvco search constants
+    #
+
+    # Fvco candidates are multiples of lcm / 2^x with x up to this power
+    FVCO_SEARCH_FRACTION_PWR = 4
+    # number of multiples per lcm fraction, counted down from MAX_PLL_F
+    FVCO_SEARCH_MULTIPLES = 2
+
+    #
+    #   Benchmark constants (python3 -m logic.Benchmark)
+    #
+
+    # stored benchmark baseline (create with --save), relative to the logic package
+    BENCH_BASELINE_FILE = "../benchBaseline.json"
+    # corpus seed + number of plans
+    BENCH_SEED = 5394
+    BENCH_SIZE = 200
+    # calls per corpus entry
+    BENCH_REPEAT = 3
+    # allowed p50 latency factor against the baseline
+    BENCH_TIME_BUDGET = 1.25
+
+    #
+    #   Tracing constants (logic.Trace)
+    #
+
+    # record spans into the ring buffer
+    TRACE_ENABLED = True
+    # number of recorded spans
+    TRACE_BUFFER_SIZE = 256
+    # print spans + debug messages at startup
+    TRACE_PRINT = False
@@ -0,0 +1,338 @@
+import asyncio
+import platform
+import traceback
+import logic
+import logic.Trace as Trace
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+
+# configuration write, taken when the command is submitted (the
+# configuration keeps changing until the command runs)
+# vddo: output voltage, register: complete transfer list
+# channels / channelRegister: changed channels + their transfer list when
+# only output channels changed, else None
+ConfigWrite = namedtuple("ConfigWrite", ["vddo", "register", "channels", "channelRegister"])
+
+#
+#   registers to write for the configuration (on the caller thread)
+#   the transfer list is already compiled when the plan was calculated / cached
+def configWrite(conf):
+    register = conf.transferList
+    if register is None:
+        register = conf.regMap.buildTransferList()
+    if conf.dirty is None or conf.dirty.pll:
+        return ConfigWrite(conf.vddo, register, None, None)
+    channels = sorted(conf.dirty.channels)
+    return ConfigWrite(conf.vddo, register, channels,
+                       conf.regMap.buildTransferList(logic.channelRegister(conf, channels)))
+
+
+#
+#   asyncio device service
+#   Owns the SPI connection and the GPIOs on one event loop (own thread)
+#    - commands are coroutines, submitted from any thread, they run one
+#      after another (device lock), at most 10 are waiting (+ status poll)
+#    - SPI transfers and all GPIO calls (setup, reset, pins, LEDs) run in
+#      a dedicated single thread executor, the loop stays responsive
+#    - GPIO edges (RPi.GPIO thread) are posted to the loop as events
+#    - the status poll is a loop timer, interval from the StatusMonitor
+#   Results are reported with callbacks, called on the loop thread:
+#   progress(text), status(Status)
+class DeviceService:
+
+    def __init__(self, config, progress, status, hardware=None):
+        self.config = config        # configuration (inputs for the lock state)
+        self.progress = progress
+        self.statusUpdate = status
+        self.hardware = ("arm" in platform.machine()) if hardware is None else hardware
+
+        self.gpio = None
+        self.spi = None
+        self.written = None     # vddo of the last full configuration write, None: not configured
+        self.monitor = logic.StatusMonitor()
+        self.poll = None        # status poll timer handle, None: update queued / running
+        self.waiting = 0        # commands waiting for the device
+        self.closed = False
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spi")
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(target=self.__run, name="device", daemon=True)
+        self.thread.start()
+        self.__submit(self.__start)
+
+    #
+    #   event loop thread
+    #
+    def __run(self):
+        asyncio.set_event_loop(self.loop)
+        self.device = asyncio.Lock()    # one command at a time
+        self.loop.run_forever()
+        self.loop.close()
+
+    #
+    #   submit command coroutine function from any thread
+    #   returns concurrent.futures.Future of the result
+    def __submit(self, command, *args):
+        return asyncio.run_coroutine_threadsafe(self.__serialized(command, *args), self.loop)
+
+    #
+    #   run command when the device is free
+    #   limited: dropped when 10 commands are waiting (status polls are not
+    #   limited, they have to reschedule the poll timer)
+    #   RUNS ON LOOP
+    async def __serialized(self, command, *args, limited=True):
+        if limited and self.waiting >= 10:
+            Trace.event("device busy, {} waiting, dropped {}", self.waiting, command.__name__)
+            self.progress("device busy, command dropped")
+            return False
+        self.waiting = self.waiting + 1
+        try:
+            async with self.device:
+                self.waiting = self.waiting - 1
+                return await command(*args)
+        except Exception:
+            traceback.print_exc()
+            return False
+
+    #
+    #   run blocking SPI / GPIO call in the executor
+    #   RUNS ON LOOP
+    async def __io(self, function, *args):
+        return await self.loop.run_in_executor(self.executor, function, *args)
+
+    #
+    #   current LOL, LOS, INTR pin levels
+    #   RUNS IN EXECUTOR
+    def __pins(self):
+        return (self.gpio.getLOL(), self.gpio.getLOS(), self.gpio.getINTR())
+
+    #
+    #   all channel LEDs off
+    #   RUNS IN EXECUTOR
+    def __ledsOff(self):
+        for led in range(6):
+            self.gpio.setLed(led, False)
+
+    #
+    #   Callback from GPIO module
+    #   when: INTR --> sticky flag, LOL / LOS level change
+    #   RUNS ON GPIO THREAD --> event on the loop
+    def __gpioChanged(self, lol, los):
+        self.loop.call_soon_threadsafe(self.__pinEvent, lol, los)
+
+    #
+    #   pin event --> status update now
+    #   RUNS ON LOOP
+    def __pinEvent(self, lol, los):
+        Trace.event("pin event lol: {} los: {}", lol, los)
+        self.monitor.pinEvent(lol, los)
+        self.__pollNow()
+
+    #
+    #   Callback from spi module
+    #   when transmission finished
+    def __spiCallback(self, info):
+        pass
+
+    #
+    #   (re)start the status poll timer
+    #   delay None: interval of the status monitor
+    def __schedulePoll(self, delay=None):
+        if self.poll is not None:
+            self.poll.cancel()
+            self.poll = None
+        if self.closed or not self.hardware:
+            return
+        self.poll = self.loop.call_later(self.monitor.interval() if delay is None else delay, self.__pollDue)
+
+    #
+    #   status update now, a queued / running update reschedules itself
+    #
+    def __pollNow(self):
+        if self.poll is not None:
+            self.__schedulePoll(0)
+
+    #
+    #   poll timer --> status update command
+    #
+    def __pollDue(self):
+        self.poll = None
+        self.loop.create_task(self.__serialized(self.__updateStatus, limited=False))
+
+    #
+    #   read status when the pins / flags require it (see StatusMonitor)
+    #   and clear the set sticky flags
+    async def __updateStatus(self):
+        try:
+            if self.closed or self.spi is None:
+                return
+            lol, los, intr = await self.__io(self.__pins)
+            if not self.monitor.readNeeded(lol, los, intr):
+                return
+
+            status = await self.__io(self.spi.readStatus)
+            self.monitor.update(status, lol, los, any(i.enabled for i in self.config.inputs))
+            self.statusUpdate(status)
+            if status.sticky():
+                await self.__clearFlags()   # release INTR
+        finally:
+            self.__schedulePoll()
+
+    #
+    #   clear interrupt flags
+    #   to remove interrupt and react to new changes
+    async def __clearFlags(self):
+        if self.spi is None:
+            return
+        map = logic.RegisterMap()
+        message = [
+            map.SYSINCAL_FLG,
+            map.LOSXAXB_FLG,
+            map.XAXB_ERR_FLG,
+            map.SMBUS_TIMEOUT_FLG,
+            map.LOS_FLG,
+            map.OOF_FLG,
+            map.LOL_FLG,
+            map.HOLD_FLG,
+            map.CAL_FLG_PLL
+        ]   # leave initial value 0, just clearing
+        await self.__io(lambda: self.spi.writeRegister(map.buildTransferList(message), force=True))
+
+    #
+    #   transmit configuration
+    #   write: ConfigWrite taken when the command was submitted
+    async def __writeConfig(self, conf, write):
+        Trace.event("started writeConfig")
+        if self.spi is None:
+            self.progress("finished")   # desktop: no device
+            return
+
+        # only output channels changed, same voltage as the last full write
+        # --> write the changed channels, keep pll + other outputs running
+        if (self.written == write.vddo and write.channelRegister is not None):
+            self.progress("write channel {}".format(write.channels))
+            await self.__io(self.spi.writeRegister, write.channelRegister, False)
+            await self.__io(self.gpio.illumChannel, conf)
+            self.progress("finished")
+            return
+
+        # disable outputs
+        self.progress("disable output")
+        await self.__io(self.gpio.setOutput, False)
+
+        # set GPIO output voltage
+        self.progress("set voltage")
+        await self.__io(self.gpio.setVoltage, write.vddo)
+
+        # write spi config
+        self.progress("write register")
+        await self.__io(self.spi.writeRegister, write.register)
+
+        # enable outputs
+        self.progress("enable output")
+        await self.__io(self.gpio.setOutput, True)
+
+        # enable LEDS on active channels
+        await self.__io(self.gpio.illumChannel, conf)
+        self.written = write.vddo
+        self.progress("finished")
+
+        # new lock state + status text
+        self.monitor.reset()
+        self.__pollNow()
+
+    #
+    #   powerdown device, for exit or when no output in use
+    #
+    async def __powerDown(self):
+        if self.spi is None:
+            return
+        self.progress("power down")
+        self.written = None
+        message = logic.RegisterMap().PDN
+        message.val = 0x1 # powerdown
+        await self.__io(self.spi.writeRegister, message.bytes()) # write config
+        await self.__io(self.__ledsOff)
+
+    #
+    #   power down clock generator
+    #   and close / reset all connections
+    async def __exit(self):
+        self.closed = True
+        self.__schedulePoll()   # closed --> poll timer cancelled
+
+        if self.hardware:
+            await self.__powerDown()
+
+            self.progress("close gpio")
+            await self.__io(self.gpio.close)
+
+            self.progress("close spi")
+            await self.__io(self.spi.close)
+        else:
+            self.progress("shutdown")
+
+    #
+    #   startup: open GPIO + SPI, reset device
+    #
+    async def __start(self):
+        if self.hardware:
+            # Raspberry
+            self.gpio = await self.__io(logic.GPIOControl, self.__gpioChanged)
+            self.spi = await self.__io(logic.Connection, self.__spiCallback)
+
+            self.progress("reset device")
+            await self.__io(self.gpio.resetDevice)  # initiate reset
+            self.spi.resetShadow()      # register values unknown
+            self.monitor.reset()        # status unknown
+
+            self.progress("enable led")
+            await self.__io(self.gpio.setLed, 6, True)  # signal ready
+            self.progress("ready")
+            self.__schedulePoll()
+
+        else:
+            # Desktop
+            self.progress("reset gpio")
+            await asyncio.sleep(2)
+
+            self.progress("enable led")
+            await asyncio.sleep(2)
+            self.progress("ready")
+
+    #
+    #   commands, callable from any thread
+    #   return concurrent.futures.Future
+    def writeConfig(self, conf):
+        return self.__submit(self.__writeConfig, conf, configWrite(conf))
+
+    def powerDown(self):
+        return self.__submit(self.__powerDown)
+
+    def clearFlags(self):
+        return self.__submit(self.__clearFlags)
+
+    def updateStatus(self):
+        return self.__submit(self.__updateStatus)
+
+    #
+    #   shutdown, the loop + executor stop after the exit command
+    #
+    def exit(self):
+        future = self.__submit(self.__exit)
+        future.add_done_callback(lambda f: self.loop.call_soon_threadsafe(self.loop.stop))
+        future.add_done_callback(lambda f: self.executor.shutdown(wait=False))
+        return future
+
+
+#
+#   Test code when started as stand-alone script (desktop mode)
+#
+if __name__ == "__main__":
+    service = DeviceService(logic.Configuration([logic.OutChannel(i) for i in range(4)], [logic.Input(i) for i in range(2)]),
+                            lambda text: print("progress:", text), lambda status: print(status), hardware=False)
+    print("powerDown:", service.powerDown().result())
+    service.exit().result()
+    service.thread.join(5)
+    print("loop stopped:", not service.thread.is_alive())
@@ -2,9 +2,17 @@
 import logic
 import numpy as np
 import math
-import Util
-
-QUIET=False
+import logic.BitWidth as BitWidth
+import logic.FreqMath as FreqMath
+import logic.FvcoSearch as FvcoSearch
+import logic.PfdSearch as PfdSearch
+import logic.Trace as Trace
+from fractions import Fraction
+
+# version of the divider solver (findFPLL + calcChannelDivider), increase on
+# every change of the calculated dividers --> stored plans of an older
+# solver are not used (see PlanDatabase)
+SOLVER_VERSION = 2
 
 #
 #   This script is a collection of methods to calculate the channel divider
@@ -17,92 +25,128 @@ QUIET=False
 
 #   Finds the internal frequency used to generate all output clocks
 #   calculate common divider values
+
 #
-# find lowest common multiplier of all
-# MN/MD*5*Fin/P=Fvco
-def findFPLL(conf, frequencies):
+#   biggest multiple of the frequencies lcm below the maximum pll frequency
+#   (multiple of the maximum frequency when the lcm exceeds it)
+def lcmFvco(frequencies):
     # active channels
-    lcm = Util.floatLCMNP(frequencies)
-    if not QUIET: print("lcm: " + str(lcm))
+    # exact lcm, stops as soon as the maximum pll frequency is exceeded
+    lcm = FreqMath.lcm(frequencies, logic.Constants.MAX_PLL_F)
+    Trace.event("lcm: {}", lcm)
 
     targetFvco = 0
-    # calculate M numerator and M denumerator
-    if (lcm <= float(logic.Constants.MAX_PLL_F)):
+    if lcm is not None:
         # maximum pll frequency not exceeded
         # calculate MN / MD to get lcm as pll frequency
-        if not QUIET: print("maximum pll frequency not exceeded")
+        Trace.event("maximum pll frequency not exceeded")
 
-        targetFvco = lcm
+        targetFvco = float(lcm)
     else:
         # maximum pll frequency exceeded
         # use maximum output frequency foutMax
-        if not QUIET: print("maximum pll frequency exceeded")
+        Trace.event("maximum pll frequency exceeded")
         targetFvco = max(frequencies)
 
-    # set Fvco to the biggest possible multiple of targetFvco
-    conf.Mxaxb_N = math.floor(logic.Constants.MAX_PLL_F/targetFvco)*targetFvco
+    # biggest possible multiple of targetFvco
+    return math.floor(logic.Constants.MAX_PLL_F/targetFvco)*targetFvco
+
+
+#
+# find lowest common multiplier of all
+# MN/MD*5*Fin/P=Fvco
+def findFPLL(conf, frequencies):
+    conf.Mxaxb_N = lcmFvco(frequencies)
     conf.Mxaxb_D = logic.Constants.EXTERNAL_REF_FREQ
     conf.fvco = conf.Mxaxb_N
-    print("conf.fvco old = " + str(conf.fvco))
+    Trace.event("conf.fvco old = {}", conf.fvco)
 
-    if conf.fvco < logic.Constants.MAX_PLL_F*0.95:
+    if conf.fvco < logic.Constants.MIN_PLL_F:
         # to low Fvco not working (example: targetFvco = 7.2GHz, ch3=720MHz, ch2=50MHz)
-        # default use f_vco = 720MHz
-        # --> use broken factor to fix (here 7200000000 + 7 * 2^-3 * 7200000000)
-        diff = logic.Constants.MAX_PLL_F*0.95 - conf.fvco    # diff to dest fvco
-        diffRel = diff/conf.fvco                            # relativ to current fvco
-        log = math.floor(math.log2(diffRel))-2              # log2(0.23) --> −2,1203 --> -3 find useable fraction of old fvco to get close to dest fvco
-        factor = math.ceil(diff/(conf.fvco * 2**int(log)))  # get factor to multiply fraction of old fvco with
-        conf.fvco = conf.fvco + factor*(conf.fvco * 2**int(log))     # 7200MHz * 7200MHz * 2^(-2) --> 7200MHz * 1.875 <-- (factor * 2^log)
+        # --> search the best scored Fvco in the VCO band
+        conf.fvco = FvcoSearch.searchFvco([f/2 for f in frequencies], 1)[0].fvco
         conf.Mxaxb_N = conf.fvco
-        print("needed to scale fvco up for best performance")
+        Trace.event("needed to search fvco in vco band for best performance")
 
     # print common divider settings
-    if not QUIET:
-        print("Mxaxb_N: " + str(conf.Mxaxb_N))
-        print("Mxaxb_D: " + str(conf.Mxaxb_D))
-        print("Fvco: " + str(conf.fvco))
+    Trace.event("Mxaxb_N: {}\nMxaxb_D: {}\nFvco: {}", conf.Mxaxb_N, conf.Mxaxb_D, conf.fvco)
 
     return conf
 
 
+#
+#   Best rational approximation of target with bounded numerator and denominator
+#   Uses the continued fraction expansion of target, the number of steps is
+#   bounded by the bit length of the denominator bound
+#   When the next convergent exceeds a bound the best semiconvergent is checked
+#   returns (numerator, denominator, error) with error = num/den - target as Fraction
+def bestRational(target, maxNum, maxDen):
+    p0, q0, p1, q1 = 0, 1, 1, 0     # convergents h(k-2)/k(k-2), h(k-1)/k(k-1)
+    n, d = target.numerator, target.denominator
+    while d != 0:
+        a = n // d
+        p2, q2 = p0 + a*p1, q0 + a*q1
+        if p2 > maxNum or q2 > maxDen:
+            # convergent exceeds bit length --> largest semiconvergent in bounds
+            k = a
+            if p1 > 0:
+                k = min(k, (maxNum - p0) // p1)
+            if q1 > 0:
+                k = min(k, (maxDen - q0) // q1)
+            best = None
+            if q1 > 0:
+                best = (p1, q1)
+            if k > 0:
+                semi = (p0 + k*p1, q0 + k*q1)
+                if best is None or abs(Fraction(*semi) - target) < abs(Fraction(*best) - target):
+                    best = semi
+            if best is None:
+                return None     # no approximation in bounds
+            return (best[0], best[1], Fraction(*best) - target)
+        p0, q0, p1, q1 = p1, q1, p2, q2
+        n, d = d, n - a*d
+
+    # exact representation
+    return (p1, q1, Fraction(0))
+
+
 #
 #   Calculates the per channel divider starting from the given internal
 #   frequency f_vco. This function is used when the destination frequency
 #   is no integer part of the f_vco
-#   Finds best divider for given pll frequency and output frequency
-#   Scales divider up until integer or stop <-- get maximum resolution
-def findBestDivider(conf, channel):
-    # print("findBestDivider for channel {}".format(channel.index))
-    bestError, bestMult = 2**logic.Constants.ND_MAX_PWR, 1
-    for i in range(1, 100):
-        nNew = conf.fvco*i
-        dNew = channel.frequency*2*i
-        errorNew = abs(conf.fvco/(nNew/float(dNew))/2-channel.frequency) # R = 2
-        # print("Error: {} multiplier: {}".format(errorNew, i))
-
-        # exceeded divider bitlength
-        if ((nNew >= (2**logic.Constants.NN_MAX_PWR)) or
-            (dNew >= (2**logic.Constants.ND_MAX_PWR))):
-            #print("Error minimization: exceeded divider bitlength")
-            break
-
-        # divider ok
-        if float(errorNew) == 0.0:
-            #print("Error minimization: error ok")
-            break
-
-        # new best value
-        if errorNew < bestError:
-            bestError = errorNew
-            bestMult = i
-
-    channel.NN = round(conf.fvco*bestMult)
-    channel.ND = round(channel.frequency*2*bestMult)
-    channel.R = 2.0
-    if not QUIET: print("Best Error: {} multiplier: {} NN: {} ND: {} R: {}".format(bestError, bestMult, channel.NN, channel.ND, channel.R))
-    channel.realFrequency = conf.fvco/(channel.NN/float(channel.ND))/channel.R
-    if not QUIET: print("Channel: {} frequency: {}".format(channel.index, channel.realFrequency))
+#   Finds the closest NN/ND = Fvco/(2*f) fitting NN_MAX_PWR / ND_MAX_PWR (R = 2)
+#   returns (NN, ND, error)
+def findBestDivider(fvco, frequency):
+    target = FreqMath.toFraction(fvco) / (FreqMath.toFraction(frequency)*2)
+    return bestRational(
+        target,
+        2**logic.Constants.NN_MAX_PWR - 1,
+        2**logic.Constants.ND_MAX_PWR - 1
+        )
+
+
+#
+#   Calculates NN / ND + R divider of one channel
+#   dividing the given Fvco down to the channel frequency
+def channelDivider(fvco, channel):
+    divider = fvco/(channel.frequency*2)
+    if (min((divider % 1), (-divider % 1)) > logic.Constants.FVCO_TO_MULTI_ERROR):
+        # PLL frequency is not multiple of target frequency
+        best = findBestDivider(fvco, channel.frequency)
+        if best is None:
+            # no NN / ND in bounds --> nearest integer divider
+            Trace.event("channel {}: no fractional divider in bounds", channel.index)
+            channel.NN, channel.ND = max(1, int(round(divider))), 1
+        else:
+            channel.NN, channel.ND, error = best
+    else:
+        # PLL frequency is multiple of target frequency
+        channel.NN = int(round(divider))
+        channel.ND = 1
+    channel.R = 2 # divide value = (R0_REG+1) x 2
+
+    channel = capNdivider(channel)
+    channel.realFrequency = fvco/(channel.NN/float(channel.ND))/channel.R
     return channel
 
 
@@ -111,58 +155,36 @@ def findBestDivider(conf, channel):
 #           this may cause (infinitly) broken N divider
 #           --> scale N divider up to reach maximum resolution
 #               cap the N divider at 2**Constants.NN_MAX_VAL_PWR
+#   closed form split, see BitWidth.splitNR
 def capNdivider(channel):
-    if ((channel.ND / channel.NN) < (1/(2**logic.Constants.NN_MAX_VAL_PWR))):
-        channel.R = 2
-
-        # half the numerator as long the MultiSynth div is smaller than 1/4096
-        while ((channel.ND / channel.NN) < (1/(2**logic.Constants.NN_MAX_VAL_PWR))):
-            channel.NN = channel.NN / 2
-            channel.R = channel.R * 2
-
-        # scale the divider up again to remove the possible decimal
-        # after the NN divider. Keep the numbers in then allowed bitwidth
-        tmpNN = channel.NN
-        tmpND = channel.ND
-        while ((channel.NN % 1) != 0 and
-                tmpNN < 2**logic.Constants.NN_MAX_PWR and
-                tmpND < 2**logic.Constants.ND_MAX_PWR):
-            channel.NN = tmpNN
-            channel.ND = tmpND
-            tmpND = tmpND * 2
-            tmpNN = tmpNN * 2
-
-        # the register map uses integers
-        channel.NN  = int(channel.NN)
-        channel.ND  = int(channel.ND)
-        channel.R   = int(channel.R)
-
+    split = BitWidth.splitNR(channel.NN, channel.ND)
+    if split is not None:
+        channel.NN, channel.ND, channel.R = split
     return channel
 
 
 #   calc NN / ND + R divider
 #   calculate per channel divider
 #   dividing Fvco down to the desired channel frequency
+#   Outputs share a MultiSynth (N divider) when possible, see shareBase
+#   --> channelDivider only runs for the base channels
 def calcChannelDivider(conf):
-    for channel in conf.channels:
+    bases = []
+    # fastest channel first, it is the base for slower channels
+    for channel in sorted(conf.channels, key=lambda ch: -ch.frequency):
         if channel.enabled:
             # channel enabled
-            divider = conf.fvco/(channel.frequency*2)
-            if not QUIET:
-                print("Channel: {} frequency: {}".format(channel.index, channel.frequency))
-                print("Divider: {}".format(divider))
-
-            if (min((divider % 1), (-divider % 1)) > logic.Constants.FVCO_TO_MULTI_ERROR):
-                if not QUIET: print("PLL frequency is not multiple of target frequency")
-                channel = findBestDivider(conf, channel)
+            shared = shareBase(bases, channel)
+            if shared is None:
+                channel = channelDivider(conf.fvco, channel)
+                bases.append(channel)
             else:
-                if not QUIET: print("PLL frequency is multiple of target frequency")
-                channel.NN = int(round(divider))
-                channel.ND = 1
-                channel.R = 2 # divide value = (R0_REG+1) x 2
-
-            channel = capNdivider(channel)
-            channel.realFrequency = conf.fvco/(channel.NN/float(channel.ND))/channel.R
+                # same N divider as the base, R divides further
+                base, m = shared
+                channel.NN, channel.ND, channel.R = base.NN, base.ND, base.R*m
+                channel.realFrequency = conf.fvco/(channel.NN/float(channel.ND))/channel.R
+            Trace.event("Channel: {} frequency: {} NN: {} ND: {} R: {} real frequency: {}",
+                channel.index, channel.frequency, channel.NN, channel.ND, channel.R, channel.realFrequency)
 
         else:
             # channel disabled
@@ -171,6 +193,34 @@ def calcChannelDivider(conf):
             channel.R   = 0
             channel.realFrequency = 0.0
 
+    return assignMultiSynth(conf)
+
+
+#
+#   MultiSynth sharing
+#   An output with the same frequency or an integer fraction f_base/m of an
+#   already calculated (faster) base channel uses the N divider of the base,
+#   the R divider does the rest: R = R_base*m (R stays even, max 2**R_MAX_PWR)
+#   returns (base, m) or None when no base fits
+def shareBase(bases, channel):
+    for base in bases:
+        ratio = FreqMath.toFraction(base.frequency) / FreqMath.toFraction(channel.frequency)
+        if ratio.denominator == 1 and base.R*ratio.numerator <= 2**logic.Constants.R_MAX_PWR:
+            return (base, ratio.numerator)
+    return None
+
+
+#
+#   Assign the MultiSynth N divider (N0-N3) to the output channels
+#   channels with the same NN / ND share one N, the N index of a group is
+#   the lowest output index of the group, disabled channels: N = -1
+def assignMultiSynth(conf):
+    groups = {}
+    for channel in sorted(conf.channels, key=lambda ch: ch.index):
+        if channel.enabled:
+            channel.N = groups.setdefault((channel.NN, channel.ND), channel.index)
+        else:
+            channel.N = -1
     return conf
 
 
@@ -182,17 +232,11 @@ def calcPhaseDetectorDivider(conf):
 
     # M divider --> Fvco = Fvco / (Fvco/Ftmp) = Fvco
     # shift left to get maximum fractional resolution
-    shift = 1
-    for i in range(logic.Constants.MN_MAX_PWR):
-        if (
-            ((math.ceil(conf.fvco) << shift) > 2**logic.Constants.MN_MAX_PWR) or
-            ((math.ceil(Ftmp) << shift) > 2**logic.Constants.MD_MAX_PWR)
-            ):
-            break   # width exceeded
-        else:
-            shift = shift + 1
+    shift = BitWidth.commonShift([
+        BitWidth.shiftToPower(math.ceil(conf.fvco), logic.Constants.MN_MAX_PWR),
+        BitWidth.shiftToPower(math.ceil(Ftmp), logic.Constants.MD_MAX_PWR)
+        ], 0, logic.Constants.MN_MAX_PWR)
 
-    shift = shift - 1   # revert last step
     conf.MN = int(conf.fvco * 2**shift)
     conf.MD = int(Ftmp * 2**shift)
     return conf
@@ -212,16 +256,15 @@ def inputConfigurationSingle(conf, index):
     # multiply by hardware feedback divider
     conf = calcPhaseDetectorDivider(conf)
 
-    if not QUIET:
-        print("InputChannel {} PN {}, PD {}, MN {}, MD {}, Fpfd {}".format(
-            index, conf.inputs[index].PN, conf.inputs[index].PD, conf.MN, conf.MD, conf.Fpfd))
+    Trace.event("InputChannel {} PN {}, PD {}, MN {}, MD {}, Fpfd {}",
+        index, conf.inputs[index].PN, conf.inputs[index].PD, conf.MN, conf.MD, conf.Fpfd)
     return conf
 
 
 #
 #   calculate input divider for locking
 #   on input clocks
-#   this implementation only uses integer P divider
+#   two inputs: integer P divider when possible, else one fractional P divider
 #   Example:
 #   Fin = 5 MHz                     # input frequency
 #   P = ceil(Fin/Fpfd_max) = 3      # maximum 2MHz Fpfd
@@ -238,29 +281,27 @@ def inputConfigurationMulti(conf):
 
     # problem: two input clocks must be divided to match one
     #   phase detector frequency
-    # two inputs --> find gcd for phase detector frequency
+    # two inputs --> find common phase detector frequency
     if conf.inputs[0].enabled and conf.inputs[1].enabled:
-        # two frequencies
-        gcd = Util.floatGcd(conf.inputs[0].frequency, conf.inputs[1].frequency)
+        # two frequencies, ranked Fpfd candidates (integer P divider first)
+        candidates = PfdSearch.pfdCandidates([conf.inputs[0].frequency, conf.inputs[1].frequency])
 
-        if (gcd < logic.Constants.F_PFD_MIN):
-            # no valid f_pfd with integer divider possible
-            print("input divider: gcd {} out of range\nfallback to use only channel 0".format(gcd))
+        if len(candidates) == 0:
+            # no valid f_pfd with integer or fractional divider possible
+            Trace.event("input divider: no common Fpfd\nfallback to use only channel 0")
         else:
             #
             #   Two input calculation
-            # P divider --> Fpfd = Fin / (Fin/Fpfd) = Fpfd
-            conf.Fpfd = gcd
-            if gcd > logic.Constants.F_PFD_MAX:
-                conf.Fpfd = gcd/math.ceil(gcd / logic.Constants.F_PFD_MAX)
-
-            for input in conf.inputs:
-                input.PN = round(input.frequency / conf.Fpfd)
-                input.PD = 1
-                if not QUIET: print("InputChannel {} PN {}, PD {}".format(input.index, input.PN, input.PD))
+            # P divider --> Fpfd = Fin / (PN/PD) = Fpfd
+            best = candidates[0]
+            conf.Fpfd = float(best.Fpfd)
+            for input, PN, PD in zip(conf.inputs, best.PN, best.PD):
+                input.PN = PN
+                input.PD = PD
+                Trace.event("InputChannel {} PN {}, PD {}", input.index, input.PN, input.PD)
 
             conf = calcPhaseDetectorDivider(conf)
-            if not QUIET: print("MN {}, MD {}, Fpfd {} Gcd {}".format(conf.MN, conf.MD, conf.Fpfd, gcd))
+            Trace.event("MN {}, MD {}, Fpfd {}", conf.MN, conf.MD, conf.Fpfd)
             return conf
 
     # Configure only one channel / fallback solution
@@ -275,37 +316,108 @@ def inputConfigurationMulti(conf):
 #   1.  calc pll frequency
 #   2.  calc per output channel divider
 #   3.  calc input divider + pll divider
+@Trace.traced("calcDivider")
 def calcDivider(conf):
     # show used configuration
     # only active (enabled) output channels
     frequenciesF = [] # float
     for channel in conf.channels:
         if channel.enabled:
-            if not QUIET: print("Channel: {} frequency: {}".format(channel.index, channel.frequency))
+            Trace.event("Channel: {} frequency: {}", channel.index, channel.frequency)
             frequenciesF.append(channel.frequency*2)
-    if not QUIET: print("Input " + str(conf.inputs))
+    Trace.event("Input {}", conf.inputs)
 
     # no output configured --> reset previously calculated values
     if (len(frequenciesF) == 0):
-        if not QUIET: print("No channels enabled, no divider calculation")
+        Trace.event("No channels enabled, no divider calculation")
         for channel in conf.channels:
             channel.NN  = 0
             channel.ND  = 0
             channel.R   = 0
+            channel.N   = -1
             channel.realFrequency = 0.0
+        conf.dirty = logic.PlanChange(True, [ch.index for ch in conf.channels])
         return conf
 
-    # find optimal pll divider for all frequencies
-    conf = findFPLL(conf, frequenciesF)
+    # command line module, imported on the first calculation
+    import logic.PlanDatabase as PlanDatabase
+    if PlanDatabase.lookupPlan(conf):
+        # precomputed plan for these frequencies
+        Trace.event("plan from plan database, fvco: {}", conf.fvco)
+    else:
+        # find optimal pll divider for all frequencies
+        conf = findFPLL(conf, frequenciesF)
 
-    #   calculate per channel output divider
-    conf = calcChannelDivider(conf)
+        #   calculate per channel output divider
+        conf = calcChannelDivider(conf)
 
     # calculate input configuration for locking on clocks
     conf = inputConfigurationMulti(conf)
 
+    # complete plan recalculated
+    conf.dirty = logic.PlanChange(True, [ch.index for ch in conf.channels])
+
     # finished
-    errors = [abs(e.realFrequency-e.frequency) for e in conf.channels]
-    if not QUIET: print("Errors: " + str(errors))
-    if not QUIET: print("Conf: " + str(conf))
+    if Trace.listening():
+        Trace.event("Errors: {}", [abs(e.realFrequency-e.frequency) for e in conf.channels])
+    Trace.event("Conf: {}", conf)
+    return conf
+
+
+#
+#   true when Fvco is an integer multiple of 2*frequency
+#   within FVCO_TO_MULTI_ERROR
+def fvcoServes(fvco, frequency):
+    if fvco <= 0 or frequency <= 0:
+        return False
+    divider = fvco/(frequency*2)
+    return min((divider % 1), (-divider % 1)) <= logic.Constants.FVCO_TO_MULTI_ERROR
+
+
+#
+#   full calculation, conf.dirty only holds the really changed parts
+#   (the full calculation may end up with the same Fvco)
+def calcDividerChanges(conf):
+    pll = (conf.fvco, conf.Mxaxb_N, conf.Mxaxb_D, conf.MN, conf.MD, [(i.PN, i.PD) for i in conf.inputs])
+    channels = [(ch.NN, ch.ND, ch.R, ch.N) for ch in conf.channels]
+
+    conf = calcDivider(conf)
+    conf.dirty = logic.PlanChange(
+        pll != (conf.fvco, conf.Mxaxb_N, conf.Mxaxb_D, conf.MN, conf.MD, [(i.PN, i.PD) for i in conf.inputs]),
+        [ch.index for ch, old in zip(conf.channels, channels) if old != (ch.NN, ch.ND, ch.R, ch.N)]
+        )
+    return conf
+
+
+#   Incremental calculation after a change of one output channel
+#   When the current Fvco still serves the channel only the channel divider
+#   are recalculated (shared MultiSynths may move), Fvco, M and the input
+#   divider are kept --> no PLL reprogram. Otherwise falls back to the full
+#   calcDivider. conf.dirty holds the changed parts of the plan
+@Trace.traced("calcDividerIncremental")
+def calcDividerIncremental(conf, index):
+    channel = conf.channels[index]
+    others = [ch for ch in conf.channels if ch.enabled and ch.index != channel.index]
+
+    # the other enabled channels must have a solved divider for this Fvco
+    if (conf.fvco < logic.Constants.MIN_PLL_F or len(others) == 0 or
+            not all(ch.NN > 0 for ch in others)):
+        return calcDivider(conf)
+
+    if channel.enabled and not fvcoServes(conf.fvco, channel.frequency):
+        # new Fvco needed
+        Trace.event("incremental: Fvco {} can not serve {}, full calculation", conf.fvco, channel.frequency)
+        conf = calcDividerChanges(conf)
+        conf.dirty.channels.add(channel.index)
+        return conf
+
+    # channel disabled or current Fvco is a multiple of the new frequency
+    # --> Fvco unchanged, channel divider + MultiSynth sharing only
+    old = [(ch.NN, ch.ND, ch.R, ch.N) for ch in conf.channels]
+    conf = calcChannelDivider(conf)
+    changed = [ch.index for ch, values in zip(conf.channels, old) if values != (ch.NN, ch.ND, ch.R, ch.N)]
+
+    Trace.event("incremental: Channel: {} frequency: {} NN: {} ND: {} R: {} N: {} real frequency: {}",
+        channel.index, channel.frequency, channel.NN, channel.ND, channel.R, channel.N, channel.realFrequency)
+    conf.dirty = logic.PlanChange(False, changed + [channel.index])
     return conf
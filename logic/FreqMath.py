@@ -0,0 +1,46 @@
+import math
+from fractions import Fraction
+
+#
+#   Exact frequency arithmetic
+#   Frequencies are converted to rational numbers (fractions.Fraction) and
+#   lcm / gcd are calculated with python big integers --> no overflow,
+#   no float rounding and no string scanning for the decimal count
+#
+
+
+#
+#   Converts a frequency value to an exact rational number
+#   Floats are converted by their decimal representation (33.333 --> 33333/1000)
+#   and not by their binary value, exponent notation is supported (1e-05)
+def toFraction(value):
+    if isinstance(value, Fraction):
+        return value
+    return Fraction(str(value))
+
+
+#
+#   Least common multiple of rational numbers
+#   lcm(a/b, c/d) = lcm(a, c) / gcd(b, d)   (reduced fractions)
+#   Stops early and returns None as soon as the lcm exceeds limit
+def lcm(values, limit=None):
+    num, den = 1, 0
+    for value in values:
+        f = toFraction(value)
+        num = math.lcm(num, f.numerator)
+        den = math.gcd(den, f.denominator)
+        if limit is not None and num > limit*den:
+            return None
+    return Fraction(num, den)
+
+
+#
+#   Greatest common divisor of rational numbers
+#   gcd(a/b, c/d) = gcd(a, c) / lcm(b, d)   (reduced fractions)
+def gcd(values):
+    num, den = 0, 1
+    for value in values:
+        f = toFraction(value)
+        num = math.gcd(num, f.numerator)
+        den = math.lcm(den, f.denominator)
+    return Fraction(num, den)
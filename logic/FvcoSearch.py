@@ -0,0 +1,81 @@
+import logic
+import math
+import logic.DividerCalc as DividerCalc
+import logic.FreqMath as FreqMath
+from collections import namedtuple
+from itertools import combinations
+
+#
+#   Search for the internal PLL frequency Fvco
+#   Enumerates valid Fvco candidates in the VCO band [MIN_PLL_F, MAX_PLL_F]
+#   for a set of output frequencies and scores every candidate by
+#   1. worst case ppm error of all channels
+#   2. number of MultiSynths with fractional N divider
+#   3. bit width of the MXAXB divider (Fvco / EXTERNAL_REF_FREQ)
+#   A candidate scores in well below 1 ms, the search runs in process
+#
+
+# scored Fvco candidate, sorts best first
+FvcoCandidate = namedtuple("FvcoCandidate", ["score", "fvco", "worstPpm", "fractional", "mxaxbBits"])
+
+
+#
+#   Enumerate candidates
+#   multiples of the lcm of every channel subset and of lcm / 2^x
+#   (the lcm itself is often to large or lies below the band)
+#   counted down from MAX_PLL_F
+def fvcoCandidates(frequencies):
+    minF = logic.Constants.MIN_PLL_F
+    maxF = logic.Constants.MAX_PLL_F
+    frequencies2 = sorted(set(f*2 for f in frequencies))
+    candidates = set()
+    for size in range(1, len(frequencies2)+1):
+        for subset in combinations(frequencies2, size):
+            # lcm / 2^x must fit below MAX_PLL_F
+            lcm = FreqMath.lcm(subset, maxF*2**logic.Constants.FVCO_SEARCH_FRACTION_PWR)
+            if lcm is None:
+                continue
+            lcm = float(lcm)
+            for x in range(logic.Constants.FVCO_SEARCH_FRACTION_PWR+1):
+                step = lcm / 2**x
+                if step > maxF:
+                    continue
+                top = math.floor(maxF/step)*step
+                for m in range(logic.Constants.FVCO_SEARCH_MULTIPLES):
+                    fvco = top - m*step
+                    if fvco < minF:
+                        break
+                    candidates.add(fvco)
+    return sorted(candidates, reverse=True)
+
+
+#
+#   Score of a solved configuration (fvco + channel dividers set), sorts best first
+#   (worst ppm error, fractional MultiSynths, MXAXB bit width, -Fvco)
+#   same score for the Fvco search and the plan results (PlanResults)
+def planScore(conf):
+    channels = [ch for ch in conf.channels if ch.enabled]
+    worstPpm = max(abs(ch.realFrequency - ch.frequency)/ch.frequency*1e6 for ch in channels)
+    fractional = len(set(ch.N for ch in channels if ch.ND > 1))
+
+    ratio = FreqMath.toFraction(conf.fvco) / logic.Constants.EXTERNAL_REF_FREQ
+    bits = max(ratio.numerator.bit_length(), ratio.denominator.bit_length())
+    return (worstPpm, fractional, bits, -conf.fvco)
+
+
+#
+#   Score one Fvco candidate for the given output frequencies
+#   uses the same channel divider calculation as calcDivider
+#   (shared MultiSynths count once)
+def scoreFvco(fvco, frequencies):
+    conf = logic.Configuration([logic.OutChannel(i, f, True) for i, f in enumerate(frequencies)], [])
+    conf.fvco = fvco
+    score = planScore(DividerCalc.calcChannelDivider(conf))
+    return FvcoCandidate(score, fvco, score[0], score[1], score[2])
+
+
+#
+#   Search best Fvco for the output frequencies
+#   returns the "count" best candidates, best first
+def searchFvco(frequencies, count=3):
+    return sorted(scoreFvco(fvco, frequencies) for fvco in fvcoCandidates(frequencies))[:count]
@@ -52,10 +52,12 @@ class GPIOControl():
         # LOL
         self.LOL = 27
         GPIO.setup(self.LOL, GPIO.IN) # LOW activ
+        GPIO.add_event_detect(self.LOL, GPIO.BOTH, callback=self.LEVEL_ISR, bouncetime=50)
 
         # LOS
         self.LOS = 22
         GPIO.setup(self.LOS, GPIO.IN) # LOW activ
+        GPIO.add_event_detect(self.LOS, GPIO.BOTH, callback=self.LEVEL_ISR, bouncetime=50)
 
         # INTR
         self.INTR = 5
@@ -126,6 +128,12 @@ class GPIOControl():
     def getLOS(self):
         return self.__negateInput(GPIO.input(self.LOS))
 
+    #
+    #   Read INTR status (sticky flag set)
+    #
+    def getINTR(self):
+        return self.__negateInput(GPIO.input(self.INTR))
+
     #
     #   set input channel
     #   valid: 0 or 2
@@ -155,6 +163,11 @@ class GPIOControl():
         print("INTERRUPT")
         self.GPIOChange(self.getLOL(), self.getLOS())
 
+    #
+    #   LOL / LOS level change
+    def LEVEL_ISR(self, unknown):
+        self.GPIOChange(self.getLOL(), self.getLOS())
+
     #
     #   read FMC information EEPROM
     #   TODO use FMC register
@@ -0,0 +1,76 @@
+import logic
+import math
+import logic.FreqMath as FreqMath
+from collections import namedtuple
+
+#
+#   Phase detector frequency (Fpfd) search for dual input locking
+#   Both inputs must be divided to one common Fpfd in [F_PFD_MIN, F_PFD_MAX]
+#   Fpfd = Fin0 * PD0/PN0 = Fin1 * PD1/PN1
+#   The input frequencies are rounded to rationals within GCD_INPUT_ERROR,
+#   all further calculation is exact and bounded by "count" steps per stage:
+#   1. integer P divider: Fpfd = gcd(Fin0, Fin1) / k
+#   2. one fractional P divider: Fpfd = Fin_i / n, the other input uses
+#      PN/PD within PN_MAX_PWR / PD_MAX_PWR
+#
+
+# Fpfd candidate, sorts best first
+# PN / PD: divider per input
+PfdCandidate = namedtuple("PfdCandidate", ["score", "Fpfd", "PN", "PD"])
+
+
+#
+#   input frequency as rational within GCD_INPUT_ERROR
+#
+def toleranceFraction(frequency):
+    maxDen = max(1, round(1/logic.Constants.GCD_INPUT_ERROR))
+    return FreqMath.toFraction(frequency).limit_denominator(maxDen)
+
+
+#
+#   create candidate when all divider fit the register width
+#
+def pfdCandidate(Fpfd, frequencies):
+    PN, PD = [], []
+    for f in frequencies:
+        ratio = f / Fpfd
+        if (ratio.numerator >= 2**logic.Constants.PN_MAX_PWR or
+            ratio.denominator >= 2**logic.Constants.PD_MAX_PWR):
+            return None
+        PN.append(ratio.numerator)
+        PD.append(ratio.denominator)
+    fractional = sum(1 for d in PD if d > 1)
+    bits = max(d.bit_length() for d in PD)
+    return PfdCandidate((fractional, bits, -Fpfd), Fpfd, PN, PD)
+
+
+#
+#   Enumerate common phase detector frequencies for two inputs
+#   returns up to "count" candidates, best first
+#   (integer divider first, then small fractional divider, then highest Fpfd)
+def pfdCandidates(frequencies, count=8):
+    fMin = logic.Constants.F_PFD_MIN
+    fMax = logic.Constants.F_PFD_MAX
+    frequencies = [toleranceFraction(f) for f in frequencies]
+    candidates = {}
+
+    # integer P divider: divide the gcd into the Fpfd band
+    gcd = FreqMath.gcd(frequencies)
+    k = max(1, math.ceil(gcd / fMax))
+    while gcd / k >= fMin and len(candidates) < count:
+        candidate = pfdCandidate(gcd / k, frequencies)
+        if candidate is not None:
+            candidates[candidate.Fpfd] = candidate
+        k = k + 1
+
+    # one fractional P divider: integer divider on input i
+    for f in frequencies:
+        n = max(1, math.ceil(f / fMax))
+        for step in range(count):
+            if f / (n+step) < fMin:
+                break
+            candidate = pfdCandidate(f / (n+step), frequencies)
+            if candidate is not None and candidate.Fpfd not in candidates:
+                candidates[candidate.Fpfd] = candidate
+
+    return sorted(candidates.values())[:count]
@@ -0,0 +1,121 @@
+import logic
+from collections import OrderedDict
+
+#
+#   Bounded LRU cache in front of calcDivider / setRegister
+#   Key: normalized channel / input configuration (see "key")
+#   Value: solved divider set + register map + compiled transfer list
+#   Returning to a recently used plan (e.g. toggling a channel off and on)
+#   only costs a dictionary lookup
+#
+class PlanCache:
+
+    #
+    #   size: maximum number of cached plans, least recently used plan is evicted
+    #
+    def __init__(self, size=32):
+        self.size = size
+        self.plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    #
+    #   normalized key of a configuration
+    #   enabled channel frequencies, input frequencies + formats, vddo
+    #   and the channel signal formats (also written for disabled channels)
+    def key(self, conf):
+        channels = tuple((ch.index, ch.frequency) for ch in conf.channels if ch.enabled)
+        signals = tuple((ch.signal.type, ch.signal.stopHigh, ch.signal.impedance) for ch in conf.channels)
+        inputs = tuple((i.index, i.frequency, i.format) for i in conf.inputs if i.enabled)
+        return (channels, signals, inputs, conf.vddo)
+
+    #
+    #   copy the solved values of a configuration
+    #
+    def __store(self, conf):
+        return (
+            (conf.MN, conf.MD, conf.Mxaxb_N, conf.Mxaxb_D, conf.Pxaxb, conf.fvco, conf.Fpfd),
+            tuple((ch.NN, ch.ND, ch.R, ch.N, ch.realFrequency) for ch in conf.channels),
+            tuple((i.PN, i.PD) for i in conf.inputs),
+            conf.regMap,
+            conf.transferList
+        )
+
+    #
+    #   write the cached values back to the configuration
+    #
+    def __restore(self, conf, plan):
+        common, channels, inputs, regMap, transferList = plan
+
+        # changed parts compared to the current plan
+        current = self.__store(conf)
+        pll = (current[0] != common) or (current[2] != inputs)
+        changed = [ch.index for ch, values, old in zip(conf.channels, channels, current[1]) if values != old]
+        conf.dirty = logic.PlanChange(pll, changed)
+
+        conf.MN, conf.MD, conf.Mxaxb_N, conf.Mxaxb_D, conf.Pxaxb, conf.fvco, conf.Fpfd = common
+        for ch, values in zip(conf.channels, channels):
+            ch.NN, ch.ND, ch.R, ch.N, ch.realFrequency = values
+        for i, values in zip(conf.inputs, inputs):
+            i.PN, i.PD = values
+        conf.regMap = regMap
+        conf.transferList = transferList
+        return conf
+
+    #
+    #   lookup plan, applies the plan to conf on hit
+    #   returns True on hit
+    def get(self, conf):
+        key = self.key(conf)
+        plan = self.plans.get(key)
+        if plan is None:
+            self.misses = self.misses + 1
+            return False
+        self.plans.move_to_end(key)
+        self.hits = self.hits + 1
+        self.__restore(conf, plan)
+        return True
+
+    #
+    #   add solved configuration
+    #   evicts the least recently used plan when full
+    def put(self, conf):
+        key = self.key(conf)
+        self.plans[key] = self.__store(conf)
+        self.plans.move_to_end(key)
+        while len(self.plans) > self.size:
+            self.plans.popitem(last=False)
+            self.evictions = self.evictions + 1
+
+    #
+    #   drop all cached plans
+    #
+    def clear(self):
+        self.plans.clear()
+
+    #
+    #   calculate divider + register + transfer list
+    #   or take them from the cache
+    #   index: changed output channel --> incremental calculation, -1: full calculation
+    def calcPlan(self, conf, index=-1):
+        if self.get(conf):
+            # the changed channel may differ in format only
+            if index >= 0:
+                conf.dirty.channels.add(index)
+            else:
+                conf.dirty.pll = True
+            return conf
+        if index >= 0:
+            conf = logic.calcDividerIncremental(conf, index)
+        else:
+            conf = logic.calcDivider(conf)
+        conf = logic.setRegister(conf)
+        conf.transferList = conf.regMap.buildTransferList()
+        self.put(conf)
+        return conf
+
+    def __str__(self):
+        return "PlanCache: size {}/{}, hits {}, misses {}, evictions {}".format(
+            len(self.plans), self.size, self.hits, self.misses, self.evictions
+        )
@@ -0,0 +1,278 @@
+import logic
+import logic.DividerCalc as DividerCalc
+import os.path as path
+import sqlite3
+import sys
+from collections import namedtuple
+from contextlib import contextmanager
+from itertools import combinations_with_replacement
+
+#
+#   Precomputed plan database for well known frequencies
+#   An offline build step solves plans for the frequency catalogue and
+#   common channel combinations and stores them in a sqlite3 database,
+#   indexed by frequency. calcDivider consults this database first.
+#   Every plan stores the solver version it was built with, only plans of
+#   the current DividerCalc.SOLVER_VERSION are used.
+#   The file is resolved relative to the logic package (PLAN_DB_FILE).
+#
+#   Build + check against the solver:
+#   python3 -m logic.PlanDatabase [channel combinations] [file]
+#
+
+# curated frequency catalogue (name, frequency)
+CATALOGUE = [
+    # Ethernet
+    ("Ethernet 25 MHz", 25_000_000.0),
+    ("Ethernet 50 MHz", 50_000_000.0),
+    ("Ethernet 125 MHz", 125_000_000.0),
+    ("10GbE 156.25 MHz", 156_250_000.0),
+    ("10GbE 161.1328125 MHz", 161_132_812.5),
+    ("25GbE 322.265625 MHz", 322_265_625.0),
+    ("100GbE 644.53125 MHz", 644_531_250.0),
+    ("Ethernet 312.5 MHz", 312_500_000.0),
+    # SDI / video
+    ("SDI 27 MHz", 27_000_000.0),
+    ("SDI 74.25 MHz", 74_250_000.0),
+    ("SDI 148.5 MHz", 148_500_000.0),
+    ("SDI 297 MHz", 297_000_000.0),
+    # PCIe / storage / USB
+    ("PCIe 100 MHz", 100_000_000.0),
+    ("SATA 150 MHz", 150_000_000.0),
+    ("USB 24 MHz", 24_000_000.0),
+    ("USB 48 MHz", 48_000_000.0),
+    # SONET / telecom
+    ("SONET 19.44 MHz", 19_440_000.0),
+    ("SONET 155.52 MHz", 155_520_000.0),
+    ("SONET 622.08 MHz", 622_080_000.0),
+    ("Reference 10 MHz", 10_000_000.0),
+    # audio
+    ("Audio 11.2896 MHz", 11_289_600.0),
+    ("Audio 12.288 MHz", 12_288_000.0),
+    ("Audio 22.5792 MHz", 22_579_200.0),
+    ("Audio 24.576 MHz", 24_576_000.0),
+    ("Audio 45.1584 MHz", 45_158_400.0),
+    ("Audio 49.152 MHz", 49_152_000.0),
+    # FPGA system clocks
+    ("FPGA 200 MHz", 200_000_000.0),
+    ("FPGA 250 MHz", 250_000_000.0),
+    ("FPGA 400 MHz", 400_000_000.0),
+]
+
+# stored plan
+StoredPlan = namedtuple("StoredPlan", ["key", "fvco", "Mxaxb_N", "Mxaxb_D", "worstPpm", "channels"])
+# stored channel divider
+StoredChannel = namedtuple("StoredChannel", ["frequency", "NN", "ND", "R", "realFrequency", "errorPpm"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    solver INTEGER NOT NULL,
+    fvco REAL NOT NULL,
+    mxaxb_n REAL NOT NULL,
+    mxaxb_d INTEGER NOT NULL,
+    worst_ppm REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS channels (
+    plan_id INTEGER NOT NULL REFERENCES plans(id),
+    frequency REAL NOT NULL,
+    nn INTEGER NOT NULL,
+    nd INTEGER NOT NULL,
+    r INTEGER NOT NULL,
+    real REAL NOT NULL,
+    error_ppm REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channels_frequency ON channels(frequency);
+CREATE INDEX IF NOT EXISTS channels_plan ON channels(plan_id);
+"""
+
+# open database connection of this process (file, connection)
+planDatabase = (None, None)
+
+
+#
+#   normalized key of the channel frequencies
+#   repeated frequencies stay in the key, they change the MultiSynth sharing
+#   and with it the solver result
+def planKey(frequencies):
+    return ",".join(repr(float(f)) for f in sorted(frequencies))
+
+
+#
+#   database file (relative to the logic package), None when disabled
+#
+def planDatabaseFile(file=None):
+    if file is None:
+        file = logic.Constants.PLAN_DB_FILE
+    if not file:
+        return None
+    return path.join(path.dirname(__file__), file)
+
+
+#
+#   returns the database connection or None when there is no database file
+#
+def connectPlanDatabase(file=None):
+    global planDatabase
+    file = planDatabaseFile(file)
+    if file is None:
+        return None
+    if planDatabase[0] == file:
+        return planDatabase[1]
+    if not path.exists(file):
+        return None
+    planDatabase = (file, sqlite3.connect(file, check_same_thread=False))
+    return planDatabase[1]
+
+
+#
+#   read the channels of a plan
+#
+def readPlan(con, row):
+    channels = [StoredChannel(*ch) for ch in con.execute(
+        "SELECT frequency, nn, nd, r, real, error_ppm FROM channels WHERE plan_id = ?", (row[0],))]
+    return StoredPlan(row[1], row[2], row[3], row[4], row[5], channels)
+
+
+#
+#   find the stored plan for exactly this set of frequencies
+#   plans of another solver version (or a database without version) are ignored
+def findPlan(frequencies, file=None):
+    con = connectPlanDatabase(file)
+    if con is None:
+        return None
+    try:
+        row = con.execute(
+            "SELECT id, key, fvco, mxaxb_n, mxaxb_d, worst_ppm FROM plans WHERE key = ? AND solver = ?",
+            (planKey(frequencies), DividerCalc.SOLVER_VERSION)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    if row is None:
+        return None
+    return readPlan(con, row)
+
+
+#
+#   range query: all plans with a channel within ppm of frequency
+#   exact: only plans without frequency error on that channel
+def queryRange(frequency, ppm=10, exact=True, file=None):
+    con = connectPlanDatabase(file)
+    if con is None:
+        return []
+    delta = frequency*ppm/1e6
+    query = ("SELECT DISTINCT p.id, p.key, p.fvco, p.mxaxb_n, p.mxaxb_d, p.worst_ppm FROM channels c "
+             "JOIN plans p ON p.id = c.plan_id WHERE c.frequency BETWEEN ? AND ?")
+    if exact:
+        query = query + " AND c.error_ppm = 0"
+    try:
+        rows = con.execute(query + " AND p.solver = ? ORDER BY p.worst_ppm, p.id",
+                           (frequency-delta, frequency+delta, DividerCalc.SOLVER_VERSION)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [readPlan(con, row) for row in rows]
+
+
+#
+#   set Fvco + channel divider from the database
+#   returns False when no plan is stored for the enabled channels
+def lookupPlan(conf):
+    frequencies = [ch.frequency for ch in conf.channels if ch.enabled]
+    plan = findPlan(frequencies)
+    if plan is None:
+        return False
+
+    conf.fvco = plan.fvco
+    conf.Mxaxb_N = plan.Mxaxb_N
+    conf.Mxaxb_D = plan.Mxaxb_D
+    stored = {ch.frequency: ch for ch in plan.channels}
+    for channel in conf.channels:
+        if channel.enabled:
+            ch = stored[float(channel.frequency)]
+            channel.NN, channel.ND, channel.R, channel.realFrequency = ch.NN, ch.ND, ch.R, ch.realFrequency
+        else:
+            channel.NN, channel.ND, channel.R, channel.realFrequency = 0, 0, 0, 0.0
+    DividerCalc.assignMultiSynth(conf)
+    return True
+
+
+#
+#   calculation without the plan database (solver measurement / comparison)
+#   with disabledPlanDatabase(): ...
+@contextmanager
+def disabledPlanDatabase():
+    file = logic.Constants.PLAN_DB_FILE
+    logic.Constants.PLAN_DB_FILE = ""
+    try:
+        yield
+    finally:
+        logic.Constants.PLAN_DB_FILE = file
+
+
+#
+#   offline build step
+#   solves every catalogue combination up to "size" channels
+#   (a frequency may repeat on several channels)
+def buildPlanDatabase(file=None, size=2):
+    file = planDatabaseFile(file)
+    if file is None:
+        raise ValueError("no plan database file")
+    con = sqlite3.connect(file)
+    con.executescript("DROP TABLE IF EXISTS channels; DROP TABLE IF EXISTS plans;")
+    con.executescript(SCHEMA)
+    frequencies = [f for name, f in CATALOGUE]
+    count = 0
+    for n in range(1, size+1):
+        for combination in combinations_with_replacement(frequencies, n):
+            channels = [logic.OutChannel(i, f, True) for i, f in enumerate(combination)]
+            conf = logic.Configuration(channels, [logic.Input(0), logic.Input(1)])
+            conf = DividerCalc.findFPLL(conf, [f*2 for f in combination])
+            conf = DividerCalc.calcChannelDivider(conf)
+
+            errors = [abs(ch.realFrequency - ch.frequency)/ch.frequency*1e6 for ch in channels]
+            cur = con.execute(
+                "INSERT INTO plans (key, solver, fvco, mxaxb_n, mxaxb_d, worst_ppm) VALUES (?, ?, ?, ?, ?, ?)",
+                (planKey(combination), DividerCalc.SOLVER_VERSION, conf.fvco, conf.Mxaxb_N, conf.Mxaxb_D, max(errors)))
+            con.executemany(
+                "INSERT INTO channels (plan_id, frequency, nn, nd, r, real, error_ppm) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(cur.lastrowid, ch.frequency, int(ch.NN), int(ch.ND), int(ch.R), ch.realFrequency, e)
+                 for ch, e in zip(channels, errors)])
+            count = count + 1
+    con.commit()
+    con.close()
+    return count
+
+
+#
+#   compare every stored plan with calcDivider without the database
+#   returns (checked plans, keys of the plans with other Fvco / divider)
+def checkPlanDatabase(file=None):
+    con = connectPlanDatabase(file)
+    if con is None:
+        return (0, [])
+    keys = [row[0] for row in con.execute("SELECT key FROM plans WHERE solver = ?", (DividerCalc.SOLVER_VERSION,))]
+    differ = []
+    for key in keys:
+        frequencies = [float(f) for f in key.split(",")]
+        plan = findPlan(frequencies, file)
+        conf = logic.Configuration([logic.OutChannel(i, f, True) for i, f in enumerate(frequencies)],
+                                   [logic.Input(0), logic.Input(1)])
+        with disabledPlanDatabase():
+            conf = DividerCalc.calcDivider(conf)
+
+        stored = sorted((ch.frequency, ch.NN, ch.ND, ch.R) for ch in plan.channels)
+        solved = sorted((ch.frequency, ch.NN, ch.ND, ch.R) for ch in conf.channels)
+        if plan.fvco != conf.fvco or stored != solved:
+            differ.append(key)
+    return (len(keys), differ)
+
+
+#
+#   build + check database when started as stand-alone script
+#
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    file = sys.argv[2] if len(sys.argv) > 2 else None
+    print("built {} plans".format(buildPlanDatabase(file, size)))
+    checked, differ = checkPlanDatabase(file)
+    print("checked {} plans against calcDivider, {} differ {}".format(checked, len(differ), differ[:5]))
@@ -0,0 +1,142 @@
+import logic
+import argparse
+import logic.DividerCalc as DividerCalc
+import logic.FvcoSearch as FvcoSearch
+import logic.PlanDatabase as PlanDatabase
+from collections import namedtuple
+
+#
+#   Top-k plan results
+#   calcDivider keeps exactly one plan in the configuration. calcPlans
+#   returns the k best plans as immutable results without touching the
+#   configuration, the operator picks one and applies it with applyPlan.
+#   Plan 0 is the plan calcDivider applies (plan database, lcm multiple or
+#   best searched Fvco), the other plans are the best scored Fvcos of the
+#   vco band, ranked with the same score as the Fvco search (planScore).
+#   The input divider (Fpfd) does not depend on Fvco and is calculated once
+#
+#   python3 -m logic.PlanResults F [F ...] [--input F] [-k K]
+#
+
+# channel of a plan result
+ChannelResult = namedtuple("ChannelResult", ["index", "frequency", "NN", "ND", "R", "N", "realFrequency", "errorPpm", "fractional"])
+
+# plan result, sorts best first
+# score: FvcoSearch.planScore (worst ppm error, fractional MultiSynths, MXAXB bits, -Fvco)
+PlanResult = namedtuple("PlanResult", ["score", "fvco", "Mxaxb_N", "Mxaxb_D", "Fpfd", "MN", "MD", "worstPpm", "channels", "inputs"])
+
+
+#
+#   working copy of the configuration, the calculation runs on this copy
+#
+def scratchConfiguration(conf):
+    channels = [logic.OutChannel(ch.index, ch.frequency, ch.enabled, ch.signal) for ch in conf.channels]
+    inputs = []
+    for i in conf.inputs:
+        input = logic.Input(i.index, i.frequency, i.format)
+        input.enabled = i.enabled
+        inputs.append(input)
+    scratch = logic.Configuration(channels, inputs)
+    scratch.vddo = conf.vddo
+    return scratch
+
+
+#
+#   immutable result of the solved working copy
+#
+def planResult(scratch):
+    channels = []
+    for ch in scratch.channels:
+        if ch.enabled:
+            channels.append(ChannelResult(ch.index, ch.frequency, ch.NN, ch.ND, ch.R, ch.N, ch.realFrequency,
+                                          abs(ch.realFrequency - ch.frequency)/ch.frequency*1e6, ch.ND > 1))
+    score = FvcoSearch.planScore(scratch)
+    return PlanResult(score, scratch.fvco, scratch.Mxaxb_N, scratch.Mxaxb_D,
+                      scratch.Fpfd, scratch.MN, scratch.MD, score[0], tuple(channels),
+                      tuple((i.PN, i.PD) for i in scratch.inputs))
+
+
+#
+#   result of the working copy with solved channel divider
+#   (MN / MD follow Fvco)
+def solvedPlan(scratch):
+    if any(i.enabled for i in scratch.inputs):
+        scratch = DividerCalc.calcPhaseDetectorDivider(scratch)
+    return planResult(scratch)
+
+
+#
+#   Calculate the k best plans for the configuration
+#   conf is not modified, returns list of PlanResult: the calcDivider plan,
+#   then the other plans best first
+#   (empty without enabled channel)
+def calcPlans(conf, k=3):
+    scratch = scratchConfiguration(conf)
+    frequencies = [ch.frequency for ch in scratch.channels if ch.enabled]
+    if len(frequencies) == 0:
+        return []
+
+    # input divider + Fpfd are independent of Fvco
+    scratch = DividerCalc.inputConfigurationMulti(scratch)
+    searched = [candidate.fvco for candidate in FvcoSearch.searchFvco(frequencies, k)]
+
+    # plan 0: calcDivider choice, stored plan or findFPLL (lcm multiple,
+    # best searched Fvco when below the vco band)
+    if not PlanDatabase.lookupPlan(scratch):
+        fvco = DividerCalc.lcmFvco([f*2 for f in frequencies])
+        if fvco < logic.Constants.MIN_PLL_F:
+            fvco = searched[0]
+        scratch.fvco, scratch.Mxaxb_N, scratch.Mxaxb_D = fvco, fvco, logic.Constants.EXTERNAL_REF_FREQ
+        scratch = DividerCalc.calcChannelDivider(scratch)
+    results = [solvedPlan(scratch)]
+
+    # best scored Fvcos of the vco band
+    for fvco in searched:
+        if fvco != results[0].fvco:
+            scratch.fvco, scratch.Mxaxb_N, scratch.Mxaxb_D = fvco, fvco, logic.Constants.EXTERNAL_REF_FREQ
+            results.append(solvedPlan(DividerCalc.calcChannelDivider(scratch)))
+    return results[:1] + sorted(results[1:])[:k-1]
+
+
+#
+#   write a picked plan into the configuration
+#   (same values as calcDivider would set)
+def applyPlan(conf, plan):
+    conf.fvco, conf.Mxaxb_N, conf.Mxaxb_D = plan.fvco, plan.Mxaxb_N, plan.Mxaxb_D
+    conf.Fpfd, conf.MN, conf.MD = plan.Fpfd, plan.MN, plan.MD
+    for input, (PN, PD) in zip(conf.inputs, plan.inputs):
+        input.PN, input.PD = PN, PD
+    results = {ch.index: ch for ch in plan.channels}
+    for channel in conf.channels:
+        ch = results.get(channel.index)
+        if ch is None:
+            channel.NN, channel.ND, channel.R, channel.N, channel.realFrequency = 0, 0, 0, -1, 0.0
+        else:
+            channel.NN, channel.ND, channel.R, channel.N, channel.realFrequency = ch.NN, ch.ND, ch.R, ch.N, ch.realFrequency
+    conf.dirty = logic.PlanChange(True, [ch.index for ch in conf.channels])
+    return conf
+
+
+#
+#   command line interface
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the k best divider plans")
+    parser.add_argument("frequencies", type=float, nargs="+", help="output frequencies in Hz (maximum 4)")
+    parser.add_argument("--input", type=float, action="append", default=[], help="input frequency in Hz (maximum 2)")
+    parser.add_argument("-k", type=int, default=3, help="number of plans")
+    args = parser.parse_args()
+
+    conf = logic.Configuration(
+        [logic.OutChannel(i, f, True) for i, f in enumerate(args.frequencies)],
+        [logic.Input(i, f) for i, f in enumerate(args.input)] + [logic.Input(i) for i in range(len(args.input), 2)])
+    for input in conf.inputs[:len(args.input)]:
+        input.enabled = True
+
+    for n, plan in enumerate(calcPlans(conf, args.k)):
+        print("plan {}: fvco {} Fpfd {} MN {} MD {} worst {:.6f} ppm".format(
+            n, plan.fvco, plan.Fpfd, plan.MN, plan.MD, plan.worstPpm))
+        for ch in plan.channels:
+            print("  channel {} N{} {} Hz --> {} Hz ({:.6f} ppm) NN {} ND {} R {}{}".format(
+                ch.index, ch.N, ch.frequency, ch.realFrequency, ch.errorPpm, ch.NN, ch.ND, ch.R,
+                " fractional" if ch.fractional else ""))
@@ -1,5 +1,7 @@
 import logic
 import math
+import logic.BitWidth as BitWidth
+import logic.Trace as Trace
 
 #
 #   Script used to set the right register values
@@ -33,15 +35,10 @@ def calcBW4(Fpfd):
 #   shifts divider to the left and returns maximum
 #   shift count with out exceeding the maximum
 def leftShiftMax(num, den, maxPwrNum, maxPwrDen):
-    num = int(round(num))
-    den = int(round(den))
-    #print("leftShiftMax num {}, den {}, maxPwrNum {}, maxPwrDen {}".format(num, den, maxPwrNum, maxPwrDen))
-    for i in range(min(maxPwrNum, maxPwrDen)):
-        if ((num << i) > (2**maxPwrNum-1)):
-            return i-1
-        if ((den << i) > (2**maxPwrDen-1)):
-            return i-1
-    return min(maxPwrNum, maxPwrDen)-1
+    return BitWidth.commonShift([
+        BitWidth.shiftToWidth(int(round(num)), maxPwrNum),
+        BitWidth.shiftToWidth(int(round(den)), maxPwrDen)
+        ], -1, min(maxPwrNum, maxPwrDen)-1)
 #
 #
 #   set OOF config register
@@ -256,7 +253,8 @@ def setLOL(conf):
 #   for every enabled output channel
 #
 def setOutputFormat(conf):
-    conf.regMap.N_CLK_DIS.val = 0x10 # default clock enable
+    # disable the clock of every unused MultiSynth
+    conf.regMap.N_CLK_DIS.val = 0x10 | (0xF & ~multiSynthBits(conf))
 
     for channel in conf.channels:
         pwrDown = 1
@@ -266,9 +264,6 @@ def setOutputFormat(conf):
         conf.regMap.OUT_FORMAT[channel.index].OUT_PDN.val = pwrDown
         conf.regMap.OUT_FORMAT[channel.index].OUT_OE.val = int(channel.enabled)
 
-        # enable clock for active channel
-        conf.regMap.N_CLK_DIS.val = conf.regMap.N_CLK_DIS.val | (pwrDown << channel.index)
-
         # R divider == 2?
         if channel.R == 2:
             conf.regMap.OUT_FORMAT[channel.index].OUT_RDIV_FORCE2.val = 1
@@ -328,9 +323,9 @@ def setOutputFormat(conf):
                 conf.regMap.OUT_FORMAT[channel.index].OUT_CM.val = 11
                 conf.regMap.OUT_FORMAT[channel.index].OUT_AMPL.val = 3
 
-        # Connect this output to the corresponding MUX
-        # TODO optimize routing in multiple channel configurations
-        conf.regMap.OUT_FORMAT[channel.index].OUT_MUX_SEL.val = channel.index
+        # Connect this output to its MultiSynth (shared N divider)
+        # disabled outputs keep the own MultiSynth
+        conf.regMap.OUT_FORMAT[channel.index].OUT_MUX_SEL.val = channel.N if channel.enabled else channel.index
 
         # These bits are set to 1 and should not be changed
         conf.regMap.OUT_FORMAT[channel.index].OUT_VDD_SEL_EN.val = 1
@@ -427,38 +422,73 @@ def setInputDivider(conf):
 #
 def setOutputDivider(conf):
     conf.regMap.N_CLK_TO_OUTX_EN.val = 0 # Routes Multisynth outputs to output driver muxes.
+    for channel in conf.channels:
+        conf.regMap.OUT_DIVIDER[channel.index].N_UPDATE.val = 0
+        conf.regMap.OUT_DIVIDER[channel.index].N_FSTEPW.val = 0 # FINC not used
+
     for channel in conf.channels:
         if channel.enabled:
             # channel enabled
+            # divide value = (R0_REG+1) x 2, one R divider per output
+            conf.regMap.OUT_DIVIDER[channel.index].R_REG.val = int((channel.R/2)-1)
+
+            # shared MultiSynth already set by another output
+            if conf.regMap.OUT_DIVIDER[channel.N].N_UPDATE.val == 1:
+                continue
+
             shift = leftShiftMax(
                 channel.NN,
                 channel.ND,
                 logic.Constants.NN_MAX_PWR,
                 logic.Constants.ND_MAX_PWR
                 )
-            # divide value = (R0_REG+1) x 2
-            conf.regMap.OUT_DIVIDER[channel.index].R_REG.val = int((channel.R/2)-1)
-            conf.regMap.OUT_DIVIDER[channel.index].N_NUM.val = int(round(channel.NN)) << shift
-            conf.regMap.OUT_DIVIDER[channel.index].N_DEN.val = int(round(channel.ND)) << shift
-            conf.regMap.OUT_DIVIDER[channel.index].N_UPDATE.val = 1
+            conf.regMap.OUT_DIVIDER[channel.N].N_NUM.val = int(round(channel.NN)) << shift
+            conf.regMap.OUT_DIVIDER[channel.N].N_DEN.val = int(round(channel.ND)) << shift
+            conf.regMap.OUT_DIVIDER[channel.N].N_UPDATE.val = 1
 
             # connect the Multisynth outputs to the output driver muxes
-            # here: connect every used MultiSynth to the corresponding Mux
-            conf.regMap.N_CLK_TO_OUTX_EN.val = (conf.regMap.N_CLK_TO_OUTX_EN.val | (1 << channel.index))
+            # here: connect every used MultiSynth
+            conf.regMap.N_CLK_TO_OUTX_EN.val = (conf.regMap.N_CLK_TO_OUTX_EN.val | (1 << channel.N))
 
             # fractional is default
             if (channel.ND <= 1):
                 # integer divider
-                conf.regMap.N_PIBYP.val = conf.regMap.N_PIBYP.val | (0x1 << channel.index)
+                conf.regMap.N_PIBYP.val = conf.regMap.N_PIBYP.val | (0x1 << channel.N)
 
-        else:
-            # channel disabled
-            conf.regMap.OUT_DIVIDER[channel.index].N_UPDATE.val = 0
 
-        conf.regMap.OUT_DIVIDER[channel.index].FSTEPW = 0 # FINC not used
+    return conf
 
+#
+#
+#   register of the given output channels
+#   used to write only the changed channels when the pll is unchanged
+#   (divider, used MultiSynth, output format + the shared enable bits)
+def channelRegister(conf, indices):
+    regs = [
+        conf.regMap.N_CLK_TO_OUTX_EN,
+        conf.regMap.N_PIBYP,
+        conf.regMap.N_CLK_DIS,
+        conf.regMap.N_PDNB
+    ]
+    multiSynths = set(indices)
+    for index in sorted(indices):
+        regs.extend(conf.regMap.OUT_FORMAT[index].getRegs())
+        if conf.channels[index].N >= 0:
+            multiSynths.add(conf.channels[index].N)
+    for index in sorted(multiSynths):
+        regs.extend(conf.regMap.OUT_DIVIDER[index].getRegs())
+    return regs
 
-    return conf
+
+#
+#   bit mask of the used MultiSynths (N divider)
+#
+def multiSynthBits(conf):
+    bits = 0
+    for channel in conf.channels:
+        if channel.enabled and channel.N >= 0:
+            bits = bits | (1 << channel.N)
+    return bits
 
 #
 #
@@ -613,8 +643,10 @@ def setHSWConfig(conf):
 #   Configuration function
 #
 #
+@Trace.traced("setRegister")
 def setRegister(conf):
     conf.regMap = logic.RegisterMap()
+    conf.transferList = None
 
     # 0x0016
     conf.regMap.LOL_ON_HOLD.val = 1
@@ -750,14 +782,8 @@ def setRegister(conf):
 
     conf.regMap.N_ADD_0P5.val = 0 # Value calculated in CBPro
 
-    # shift bits to match enabled dividers
-    powerUpBits, bit = 0,1
-    for ch in conf.channels:
-        if ch.enabled:
-            powerUpBits = powerUpBits | bit
-        bit = bit << 1
-
-    conf.regMap.N_PDNB.val = powerUpBits # enabled dividers
+    # power up the used MultiSynths only
+    conf.regMap.N_PDNB.val = multiSynthBits(conf) # enabled dividers
 
     # phase change registers
     # conf = setPhaseChange(conf)
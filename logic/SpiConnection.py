@@ -1,12 +1,25 @@
 import spidev
+import math
 import time
 import logic
 import sys
+import logic.SpiTransaction as SpiTransaction
+import logic.Trace as Trace
+from collections import namedtuple
+
+# statistic of the last writeRegister
+# bytes: written bytes, selects: page select writes, avoided: skipped page
+# selects (device already on the page), messages / transfers: submitted
+# SPI_IOC_MESSAGE ioctls / transfers, time: SPI wall time in ns
+WriteStats = namedtuple("WriteStats", ["bytes", "selects", "avoided", "messages", "transfers", "time"])
 
 #
 #   SPI connection handling class
 #   Used for writing / reading
 #   Handles page adressing and burst writing
+#   The selected page is tracked, page selects are only written on a change
+#   All commands are queued in a Transaction and submitted as one ioctl
+#   (before a read, before the pll change wait and at the end of a write)
 class Connection:
 
     def __init__(self, callback):
@@ -17,6 +30,17 @@ class Connection:
         # chech write commands by reading back
         self.check = False
 
+        # bytes written to the device (TransferList), transfer lists are
+        # written as delta against this shadow image
+        # None --> device state unknown, the next transfer list is written completely
+        self.shadow = None
+
+        # selected page of the device, None --> unknown (start, soft reset, error)
+        self.page = None
+        self.pageSelects = 0
+        self.pageAvoided = 0
+        self.lastWrite = WriteStats(0, 0, 0, 0, 0, 0)
+
         # spi frequency
         self.freq   = 10_000_000    # 10 MHz
         self.bus    = 0 # default bus
@@ -44,58 +68,75 @@ class Connection:
         self.spi.lsbfirst = False    # MSB first
         self.spi.open(self.bus, self.device) # /dev/spidev0.1
 
+        # command queue, gap between commands: 6 spi clocks (minimum 1 us)
+        self.transaction = SpiTransaction.Transaction(self.spi.fileno(), self.freq, math.ceil(6*1e6/self.freq))
+
         # test spi connection
         print("init spi connection")
-        self.__setPage(0)
-        list = self.__readBytes(2,2)
-        print("spi device: Si{}{}".format(hex(list[1])[2:], hex(list[0])[2:]))
-
+        id = self.readRange(0x0002, 2)
+        print("spi device: Si{}{}".format(hex(id[1])[2:], hex(id[0])[2:]))
 
-    #
-    #   delay between commands
-    #
-    def __commDelay(self):
-        time.sleep(6*1/self.freq)
 
     #
     #   set selected register page
-    #
+    #   skipped when the device is already on this page
     def __setPage(self, page):
-        self.spi.writebytes([self.set_adr, 0x1])     # page register address
-        self.__commDelay()
-        self.spi.writebytes([self.wr_data, page])    # page number
-        self.__commDelay()
+        if page == self.page:
+            self.pageAvoided = self.pageAvoided + 1
+            return
+        self.transaction.frame(bytes((self.set_adr, 0x1)))     # page register address
+        self.transaction.frame(bytes((self.wr_data, page)))    # page number
+        self.page = page
+        self.pageSelects = self.pageSelects + 1
 
         #if (self.check):
             #print("check read page " + str(page))
-            #print("page: " + str(self.__readBytes(0x1, 1)))
+            #print("page: " + str(self.readRange(0x1, 1)))
 
 
     #
-    #   Reads length bytes starting from start
-    #   at current page, returns list
-    def __readBytes(self, start, length):
-        list = []
-        received = self.spi.xfer([self.set_adr, start, self.rd_data_inc, 0x0])
-        list.append(received[3])
-        #print("received: " + str(received))
-        self.__commDelay()
+    #   Reads length bytes starting from register address start, returns bytes
+    #   one frame per page: set address + auto increment reads
+    #   (full duplex, every second received byte is data)
+    #   the queued commands and all pages are submitted as one transaction
+    def readRange(self, start, length):
+        return self.readRanges((start, length))[0]
 
-        # transfer data
-        for i in range(length-1):
-            received = self.spi.xfer([self.rd_data_inc, 0x0])
-            list.append(received[1])
-            #print("received: " + str(received))
-            self.__commDelay()
+    #
+    #   Reads several address ranges (start, length) in one transaction
+    #   returns list of bytes
+    def readRanges(self, *ranges):
+        received = []
+        for start, length in ranges:
+            frames = []
+            address = start
+            while address < start + length:
+                # auto increment stays on the page --> one frame per page
+                count = min(start + length, (address//256 + 1)*256) - address
+                self.__setPage(address//256)
+                frames.append(self.transaction.frame(bytes((self.set_adr, address%256)) +
+                                                     bytes((self.rd_data_inc, 0x0))*count, read=True))
+                address = address + count
+            received.append(frames)
+        self.__submit()
 
-        return list
+        return [b"".join(bytes(memoryview(rx)[3::2]) for rx in frames) for frames in received]
+
+    #
+    #   submit the queued commands
+    #   transfer error --> selected page + device image unknown
+    def __submit(self):
+        try:
+            self.transaction.submit()
+        except OSError:
+            self.page = None
+            self.shadow = None
+            raise
 
 
     def readStatus(self):
-        self.__setPage(0)
-        page0 = self.__readBytes(0xD, 0x7) # read d,e,f,10,11,12,13
-        self.__setPage(5)
-        page5 = self.__readBytes(0x7, 0x1) # read 0x507
+        # read d,e,f,10 + flags 11-14 + interrupt masks 17-1a + 0x507
+        page0, page5 = self.readRanges((0x000D, 14), (0x0507, 1))
         res = logic.Status(page0)
         if len(page5):
             res.input = page5[0] >> 6
@@ -104,61 +145,126 @@ class Connection:
 
     #
     #   write data using burst write command
-    #   [(adr,dat),(adr,dat),(adr,dat),...]
+    #   payload: bytes of the consecutive registers from start
     #   all registers must be on one page!
-    def __burstWrite(self, data):
-        self.__setPage(data[0][0]//256)
-        payload = list(map(lambda x: x[1], data))  # list only data
-        payload.insert(0, self.wr_burst)    # write command in first position
-        payload.insert(1, data[0][0]%256)   # set start address
-        self.__commDelay()
-        self.spi.writebytes2(payload) # better than writebytes() when larger than buffer # TODO error TypeError: Non-Int/Long value in arguments: 70fa7df0.
-        self.__commDelay()
+    def __burstWrite(self, start, payload):
+        with Trace.span("spiBurst", start):
+            self.__burst(start, payload)
+
+    #
+    #   burst write of __burstWrite
+    #   payload is a memoryview slice of the transfer list image (or bytes)
+    def __burst(self, start, payload):
+        self.__setPage(start//256)
+        header = bytes((self.wr_burst, start%256))  # write command, start address
+        self.transaction.frame(header, payload)     # one chip select frame, payload without copy
+        if self.shadow is not None:
+            self.shadow.put(start, payload)
+
+        # soft reset --> page register reset
+        reset = self.softReset[0][0] - start
+        if 0 <= reset < len(payload) and payload[reset]:
+            self.page = None
 
         # CHECK read
         if (self.check):
-            print("__burstWrite payload: " + str(payload))
-            print("lengths: " + str(list(map(lambda x: type(x), payload))))
-            read = self.__readBytes(data[0][0]%256, len(data))
-            if (len(data) != len(read)):
-                print("read after write length mismatch: {} != {}".format(len(data), len(read)))
+            Trace.event("__burstWrite payload: {}", list(payload))
+            read = self.readRange(start, len(payload))
+            if (len(payload) != len(read)):
+                Trace.event("read after write length mismatch: {} != {}", len(payload), len(read))
+                self.shadow = None  # verification failed --> next write complete
+                self.page = None
             else:
-                for i in range(len(data)):
-                    print("adr: {} wr: {} rd: {}".format(data[i][0], data[i][1], read[i]))
+                for i in range(len(payload)):
+                    Trace.event("adr: {} wr: {} rd: {}", start+i, payload[i], read[i])
+                    if (payload[i] ^ read[i]) & ~logic.strobeMap()[start+i]:
+                        self.shadow = None  # verification failed --> next write complete
+                        self.page = None
 
 
     #   write register list
-    #   [(adr,dat),(adr,dat),(adr,dat),...]
-    #   grouping addresses for burst write
+    #   TransferList: bursts of the page image, starting with the current
+    #   page and then ascending (wrapping) --> every page selected once,
+    #   the address order within a page is kept
+    #   [(adr,dat),(adr,dat),(adr,dat),...]: grouping addresses for burst
+    #   write, the list order is kept (preamble / postamble)
     def __writeList(self, data):
+        if isinstance(data, logic.TransferList):
+            bursts = list(data.bursts())
+            if self.page is not None:
+                bursts = ([b for b in bursts if b[0]//256 >= self.page] +
+                          [b for b in bursts if b[0]//256 < self.page])
+            for start, payload in bursts:
+                self.__burstWrite(start, payload)
+            return
+
         last = (data[0][0]-1, 0)
-        list = []
+        start = data[0][0]
+        values = []
         for reg in data:
             if (reg[0] == last[0]+1) and (reg[0]//256 == last[0]//256):
                 # register follows last register and is on same page
-                list.append(reg)
+                values.append(reg[1])
             else:
                 # register doesnt follow last register or is on other page
-                self.__burstWrite(list)
-                list = [reg]
+                self.__burstWrite(start, bytes(values))
+                start = reg[0]
+                values = [reg[1]]
 
             # new last written register
             last = reg
 
         # write last registers
-        self.__burstWrite(list)
+        self.__burstWrite(start, bytes(values))
 
     #
     #   write register map with
     #    preamble, wait, data, soft reset, postamble
-    def writeRegister(self, data):
-        self.__writeList(self.preamble)
-        time.sleep(0.3) # 4.2 Dynamic PLL Changes --> 300ms wait
-        self.__writeList(data)
+    #   pllChange False: only output divider / format changed
+    #    --> data only, the N_UPDATE bits apply the new divider
+    #   TransferList data: only the bytes differing from the shadow image are
+    #   written, force: write all bytes (e.g. status flags to clear)
+    @Trace.traced("writeRegister")
+    def writeRegister(self, data, pllChange=True, force=False):
+        if isinstance(data, logic.TransferList):
+            if self.shadow is None:
+                self.shadow = logic.TransferList()
+            elif not force:
+                data = data.changes(self.shadow)
 
-        self.__writeList(self.postamble)
-        self.callback("wrote {} register".format(len(data)))
+        self.pageSelects, self.pageAvoided = 0, 0
+        self.transaction.resetStats()
+        try:
+            if pllChange:
+                self.__writeList(self.preamble)
+                self.transaction.submit()
+                time.sleep(0.3) # 4.2 Dynamic PLL Changes --> 300ms wait
+            if len(data):
+                self.__writeList(data)
 
+            if pllChange:
+                self.__writeList(self.postamble)
+            self.transaction.submit()
+        except OSError:
+            # transfer error (also of a full queue submitted by a frame)
+            # --> selected page + device image unknown
+            self.page = None
+            self.shadow = None
+            raise
+
+        self.lastWrite = WriteStats(len(data), self.pageSelects, self.pageAvoided,
+                                    self.transaction.messages, self.transaction.submitted, self.transaction.time)
+        Trace.event("write: {} bytes, {} page selects, {} avoided, {} messages, {} transfers, {} ns", *self.lastWrite)
+        self.callback("wrote {} register ({} page selects, {} avoided, {:.1f} ms)".format(
+            len(data), self.pageSelects, self.pageAvoided, self.transaction.time/1e6))
+
+
+    #
+    #   forget the shadow image, the next transfer list is written completely
+    #   (after a device reset)
+    def resetShadow(self):
+        self.shadow = None
+        self.page = None
 
     #
     #   close connection
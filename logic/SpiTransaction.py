@@ -0,0 +1,141 @@
+import ctypes
+import fcntl
+import time
+import logic.Trace as Trace
+
+#
+#   Batched SPI transactions
+#   Page selects, burst writes and reads are queued as chip select frames
+#   and submitted with one SPI_IOC_MESSAGE ioctl on the spidev device
+#   instead of one writebytes / xfer call + sleep per command.
+#   The gap between two frames is the delay_usecs of the last transfer of
+#   a frame (chip select toggled by cs_change), no Python sleep.
+#   Burst payloads are passed without copy when they are writable buffers
+#   (memoryview slices of a TransferList image)
+#
+#   see linux/spi/spidev.h
+#
+
+# maximum transfers per message (SPI_MSGSIZE limit 16 KiB / 32 byte)
+MAX_TRANSFERS = 256
+
+# maximum bytes per message (spidev "bufsiz" module parameter, default 4096)
+MAX_BYTES = 4096
+
+
+#
+#   struct spi_ioc_transfer
+#
+class SpiIocTransfer(ctypes.Structure):
+    _fields_ = [
+        ("tx_buf", ctypes.c_uint64),
+        ("rx_buf", ctypes.c_uint64),
+        ("len", ctypes.c_uint32),
+        ("speed_hz", ctypes.c_uint32),
+        ("delay_usecs", ctypes.c_uint16),
+        ("bits_per_word", ctypes.c_uint8),
+        ("cs_change", ctypes.c_uint8),
+        ("tx_nbits", ctypes.c_uint8),
+        ("rx_nbits", ctypes.c_uint8),
+        ("word_delay_usecs", ctypes.c_uint8),
+        ("pad", ctypes.c_uint8)
+    ]
+
+
+#
+#   ioctl request SPI_IOC_MESSAGE(count)
+#   _IOW(SPI_IOC_MAGIC, 0, char[count * sizeof(spi_ioc_transfer)])
+def spiIocMessage(count):
+    return (1 << 30) | ((count * ctypes.sizeof(SpiIocTransfer)) << 16) | (ord("k") << 8)
+
+
+#
+#   ctypes buffer on data
+#   writable buffers (bytearray, memoryview of bytearray) are used without
+#   copy, read-only data (bytes, list) is copied
+def ctypesBuffer(data):
+    try:
+        return (ctypes.c_ubyte * len(data)).from_buffer(data)
+    except TypeError:
+        return (ctypes.c_ubyte * len(data)).from_buffer_copy(bytes(data))
+
+
+#
+#   queue of chip select frames, submitted as one ioctl
+#   fd: spidev file descriptor, speed: clock in Hz, delay: gap between
+#   frames in us
+class Transaction:
+
+    def __init__(self, fd, speed, delay):
+        self.fd = fd
+        self.speed = speed
+        self.delay = delay
+
+        # queued transfers: (tx buffer, rx buffer or None, frame end)
+        self.transfers = []
+        self.bytes = 0
+
+        # statistics: submitted messages / transfers, ns spent in the ioctl
+        self.messages = 0
+        self.submitted = 0
+        self.time = 0
+
+    #
+    #   queue one chip select frame
+    #   parts: data written in this frame (e.g. command header + payload)
+    #   read True: the received bytes of the frame are returned as bytearray
+    #   (valid after submit)
+    def frame(self, *parts, read=False):
+        size = sum(len(part) for part in parts)
+        if (len(self.transfers) + len(parts) > MAX_TRANSFERS) or (self.bytes + size > MAX_BYTES):
+            self.submit()
+
+        rx = bytearray(size) if read else None
+        offset = 0
+        for n, part in enumerate(parts):
+            rxPart = None
+            if rx is not None:
+                rxPart = ctypesBuffer(memoryview(rx)[offset:offset + len(part)])
+            self.transfers.append((ctypesBuffer(part), rxPart, n == len(parts) - 1))
+            offset = offset + len(part)
+        self.bytes = self.bytes + size
+        return rx
+
+    #
+    #   submit the queued frames as one SPI_IOC_MESSAGE
+    #   the queue is cleared also when the ioctl fails
+    def submit(self):
+        count = len(self.transfers)
+        if count == 0:
+            return
+        message = (SpiIocTransfer * count)()
+        for n, (tx, rx, end) in enumerate(self.transfers):
+            message[n].tx_buf = ctypes.addressof(tx)
+            message[n].rx_buf = ctypes.addressof(rx) if rx is not None else 0
+            message[n].len = len(tx)
+            message[n].speed_hz = self.speed
+            message[n].bits_per_word = 8
+            if end:
+                # end of frame: gap + chip select toggle (not after the last transfer)
+                message[n].delay_usecs = self.delay
+                message[n].cs_change = int(n < count - 1)
+
+        transfers = self.transfers  # buffers referenced until the ioctl returned
+        self.transfers = []
+        self.bytes = 0
+        with Trace.span("spiSubmit", count):
+            start = time.perf_counter_ns()
+            try:
+                fcntl.ioctl(self.fd, spiIocMessage(count), message)
+            finally:
+                self.time = self.time + time.perf_counter_ns() - start
+        self.messages = self.messages + 1
+        self.submitted = self.submitted + count
+
+    #
+    #   reset statistics
+    #
+    def resetStats(self):
+        self.messages = 0
+        self.submitted = 0
+        self.time = 0
@@ -8,15 +8,32 @@ class Status:
     hold = True # hold
     input = -1  # current locked input channel
 
+    # sticky flag bits of register 11,12,13,14
+    FLAG_MASK = (0x2B, 0xFF, 0x22, 0x20)
+
     #   Create status object from register values
-    #   Argument: list of register d,e,f,10,11,12,13
+    #   Argument: list of register d,e,f,10,11,12,13(,14,15,16,17,18,19,1a)
+    #   register 17-1a: interrupt masks of the flags in 11-14 (same bits),
+    #   masked flags do not assert INTR and are ignored
     def __init__(self, res):
+        self.los = [True, True, True, True]
+        self.oof = [True, True, True, True]
+        self.flags = tuple(res[4+i] & mask & ~(res[10+i] if 10+i < len(res) else 0)
+                           for i, mask in enumerate(self.FLAG_MASK) if 4+i < len(res))
         for i in range(4):
             self.los[i] = (res[0] & (0x1 << i)) > 0
             self.oof[i] = (res[0] & (0x10 << i)) > 0
         self.hold = (res[1] & 0x20) > 0
         self.lol = (res[1] & 0x2) > 0
 
+    #   unmasked sticky flag set, the flags have to be cleared to release INTR
+    def sticky(self):
+        return any(self.flags)
+
+    #   state for change detection
+    def key(self):
+        return (tuple(self.los), tuple(self.oof), self.lol, self.hold, self.input, self.flags)
+
     # String representation
     def __str__(self):
         text = "status:\nlol: " + str(int(self.lol))
@@ -0,0 +1,107 @@
+import time
+import threading
+import logic
+
+#
+#   Status engine
+#   The INTR edge (sticky flag set) and the LOL / LOS pin levels are the main
+#   signal, the SPI status is only read when
+#    - a pin event arrived (INTR edge, LOL / LOS level change)
+#    - INTR is still asserted (sticky flags to decode and clear)
+#    - the pin levels differ from the last read status
+#    - the device is unlocked (lock progress of the inputs)
+#    - no status was read for the slow interval (missed edges)
+#   The poll interval is fast while unlocked or after a change and doubles
+#   per quiet poll up to the slow interval while locked.
+#   All calls come from the DeviceService loop (pin events are posted from
+#   the GPIO thread to the loop), the lock keeps the state consistent for
+#   callers on other threads
+class StatusMonitor:
+
+    def __init__(self, fast=None, slow=None):
+        self.fast = logic.Constants.STATUS_POLL_FAST if fast is None else fast
+        self.slow = logic.Constants.STATUS_POLL_SLOW if slow is None else slow
+        self.lock = threading.Lock()
+
+        self.status = None  # last read status, None --> read needed
+        self.pins = None    # (lol, los) pin levels of the last read
+        self.pending = False    # pin event since the last read
+        self.lastRead = 0.0     # time.monotonic() of the last read
+        self.delay = self.fast  # current poll interval
+        self.reads = 0
+        self.skipped = 0
+
+    #
+    #   pin event (INTR edge, LOL / LOS level change)
+    #   RUNS ON DEVICE LOOP
+    def pinEvent(self, lol, los):
+        with self.lock:
+            self.pending = True
+            self.delay = self.fast
+
+    #
+    #   poll interval in s
+    #
+    def interval(self):
+        with self.lock:
+            return self.delay
+
+    #
+    #   decide if the poll has to read the SPI status
+    #   lol, los, intr: current pin levels (True: active)
+    #   a skipped read counts as quiet poll
+    def readNeeded(self, lol, los, intr):
+        with self.lock:
+            needed = (self.pending or intr or self.status is None or (lol, los) != self.pins or
+                      lol or time.monotonic() - self.lastRead >= self.slow)
+            if not needed:
+                self.skipped = self.skipped + 1
+                self.delay = min(self.slow, self.delay*2)
+            return needed
+
+    #
+    #   read status
+    #   lol, los: pin levels at the read
+    #   locking: any input enabled (without input LOL is no error, no fast poll)
+    #   returns True when the status changed
+    def update(self, status, lol, los, locking=True):
+        with self.lock:
+            changed = self.status is None or status.key() != self.status.key()
+            self.status = status
+            self.pins = (lol, los)
+            self.pending = False
+            self.lastRead = time.monotonic()
+            self.reads = self.reads + 1
+            if changed or status.sticky() or (locking and status.lol):
+                self.delay = self.fast
+            else:
+                self.delay = min(self.slow, self.delay*2)
+            return changed
+
+    #
+    #   forget the status (after a device reset / configuration write)
+    #
+    def reset(self):
+        with self.lock:
+            self.status = None
+            self.pending = True
+            self.delay = self.fast
+
+
+#
+#   Test code when started as stand-alone script
+#
+if __name__ == "__main__":
+    monitor = StatusMonitor(0.5, 60.0)
+    locked = logic.Status([0x0F, 0x00, 0, 0, 0, 0, 0, 0])
+    unlocked = logic.Status([0x0F, 0x02, 0, 0, 0, 0, 0x02, 0])
+    print("initial read:", monitor.readNeeded(False, False, False))
+    monitor.update(locked, False, False)
+    for i in range(8):
+        print("quiet poll {}: read {} interval {}".format(i, monitor.readNeeded(False, False, False), monitor.interval()))
+    print("LOL pin:", monitor.readNeeded(True, False, False))
+    print("changed:", monitor.update(unlocked, True, False), "sticky:", unlocked.sticky(), "interval", monitor.interval())
+    masked = logic.Status([0x0F, 0x00, 0, 0, 0, 0xFF, 0, 0, 0, 0, 0, 0xFF, 0x22, 0x20])
+    print("masked LOS / OOF flags sticky:", masked.sticky())
+    monitor.pinEvent(False, False)
+    print("after event:", monitor.readNeeded(False, False, False), monitor.interval())
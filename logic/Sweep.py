@@ -0,0 +1,124 @@
+import logic
+import argparse
+import csv
+import json
+import math
+import sys
+import logic.DividerCalc as DividerCalc
+import logic.FreqMath as FreqMath
+import logic.FvcoSearch as FvcoSearch
+from collections import namedtuple
+
+#
+#   Frequency sweep of one output channel
+#   Calculates the real output frequency and the error for every requested
+#   frequency of a range while the other channels keep their frequency.
+#   The points are generated lazily (constant memory), the lcm of the fixed
+#   channels is calculated once and only extended by the swept frequency
+#
+#   python3 -m logic.Sweep START STOP STEP [--fixed F ...] [--format csv|jsonl]
+#
+
+# one sweep point, error = real - requested in Hz
+SweepPoint = namedtuple("SweepPoint", ["requested", "real", "error", "NN", "ND", "R"])
+
+
+#
+#   Fvco chosen by findFPLL for the fixed channels + 2*frequency
+#   lcmFixed: [lcm of the fixed channels (2*f)], [] without fixed channels,
+#             None when MAX_PLL_F is exceeded
+#   maxFixed: maximum of the fixed channels (2*f)
+def planFvco(lcmFixed, maxFixed, frequencies, frequency):
+    lcm = None
+    if lcmFixed is not None:
+        lcm = FreqMath.lcm(lcmFixed + [frequency*2], logic.Constants.MAX_PLL_F)
+
+    if lcm is not None:
+        targetFvco = float(lcm)
+    else:
+        targetFvco = max(maxFixed, frequency*2)
+
+    fvco = math.floor(logic.Constants.MAX_PLL_F/targetFvco)*targetFvco
+    if fvco < logic.Constants.MIN_PLL_F:
+        # same VCO band search as findFPLL
+        fvco = FvcoSearch.searchFvco(frequencies + [frequency], 1)[0].fvco
+    return fvco
+
+
+#
+#   Sweep generator
+#   yields a SweepPoint for start, start+step, ... <= stop
+#   fixed: frequencies of the other (enabled) channels
+#   fvco: None --> Fvco per point as calcDivider would choose it
+#         else this Fvco is kept for all points (incremental calculation)
+def sweep(start, stop, step, fixed=(), fvco=None):
+    fixed = list(fixed)
+    lcmFixed, maxFixed = [], 0.0
+    if len(fixed) > 0:
+        lcm = FreqMath.lcm([f*2 for f in fixed], logic.Constants.MAX_PLL_F)
+        lcmFixed = None if lcm is None else [lcm]
+        maxFixed = max(f*2 for f in fixed)
+
+    channel = logic.OutChannel(0, 0.0, True)
+    count = math.floor((stop - start)/step + 1e-9) + 1
+    for i in range(max(0, count)):
+        frequency = start + i*step
+        channel.frequency = frequency
+        pointFvco = fvco
+        if pointFvco is None:
+            pointFvco = planFvco(lcmFixed, maxFixed, fixed, frequency)
+        channel = DividerCalc.channelDivider(pointFvco, channel)
+        yield SweepPoint(frequency, channel.realFrequency, channel.realFrequency - frequency,
+                         int(channel.NN), int(channel.ND), int(channel.R))
+
+
+#
+#   Fvco of the plan of the fixed channels
+#   used to sweep with unchanged pll
+def fixedFvco(fixed):
+    conf = logic.Configuration([logic.OutChannel(i, f, True) for i, f in enumerate(fixed)], [logic.Input(0), logic.Input(1)])
+    return DividerCalc.findFPLL(conf, [f*2 for f in fixed]).fvco
+
+
+#
+#   write sweep points to stream as csv or jsonl
+#   returns number of written points
+def writeSweep(points, stream, format="csv"):
+    count = 0
+    writer = csv.writer(stream)
+    if format == "csv":
+        writer.writerow(SweepPoint._fields)
+    for point in points:
+        if format == "csv":
+            writer.writerow(point)
+        else:
+            stream.write(json.dumps(point._asdict()) + "\n")
+        count = count + 1
+    return count
+
+
+#
+#   command line interface
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep one output channel and stream real frequency + error")
+    parser.add_argument("start", type=float, help="first requested frequency in Hz")
+    parser.add_argument("stop", type=float, help="last requested frequency in Hz")
+    parser.add_argument("step", type=float, help="frequency step in Hz")
+    parser.add_argument("--fixed", type=float, action="append", default=[], help="frequency of another enabled channel in Hz (repeatable)")
+    parser.add_argument("--keep", action="store_true", help="keep the Fvco of the fixed channels (no pll change)")
+    parser.add_argument("--fvco", type=float, default=None, help="use this Fvco for all points")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--output", default=None, help="output file, default stdout")
+    args = parser.parse_args()
+
+    fvco = args.fvco
+    if args.keep and fvco is None and len(args.fixed) > 0:
+        fvco = fixedFvco(args.fixed)
+
+    points = sweep(args.start, args.stop, args.step, args.fixed, fvco)
+    if args.output is None:
+        writeSweep(points, sys.stdout, args.format)
+    else:
+        with open(args.output, "w", newline="") as f:
+            writeSweep(points, f, args.format)
@@ -0,0 +1,183 @@
+import functools
+import logic
+import time
+from collections import deque
+from collections import namedtuple
+
+#
+#   Structured tracing
+#   Named spans (calcDivider, setRegister, buildTransferList, writeRegister,
+#   spiBurst, ...) record their monotonic start time + duration into a ring
+#   buffer. Nothing is formatted unless a sink is enabled:
+#   - span records hold the raw name / info values
+#   - events (former debug prints) keep message + arguments unformatted and
+#     are only formatted by the sinks
+#   Disabled tracing (TRACE_ENABLED = False) costs one flag check per span
+#
+#   Usage:
+#       @traced("calcDivider")          function span
+#       with span("spiBurst", info):    block span
+#       event("lcm: {}", lcm)           lazy formatted message
+#       if listening(): event(...)      guard for expensive arguments
+#       addSink(printSink)              print spans + events
+#
+
+# finished span: name, start + duration in ns (perf_counter_ns), optional info
+SpanRecord = namedtuple("SpanRecord", ["name", "start", "duration", "info"])
+
+# tracing state of this process
+enabled = logic.Constants.TRACE_ENABLED
+buffer = deque(maxlen=logic.Constants.TRACE_BUFFER_SIZE)
+sinks = []
+
+
+#
+#   block span, used as context manager
+#
+class Span:
+    __slots__ = ("name", "info", "start")
+
+    def __init__(self, name, info):
+        self.name = name
+        self.info = info
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        record(self.name, self.start, time.perf_counter_ns() - self.start, self.info)
+        return False
+
+
+#
+#   span replacement when tracing is disabled
+#
+class NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        return False
+
+NO_SPAN = NoSpan()
+
+
+#
+#   enable / disable span recording
+#
+def setEnabled(state):
+    global enabled
+    enabled = state
+
+
+#
+#   store finished span and pass it to the sinks
+#
+def record(name, start, duration, info=None):
+    span = SpanRecord(name, start, duration, info)
+    buffer.append(span)
+    for sink in sinks:
+        sink(span)
+
+
+#
+#   block span: with span("name", info): ...
+#
+def span(name, info=None):
+    if not enabled:
+        return NO_SPAN
+    return Span(name, info)
+
+
+#
+#   function span decorator
+#   the flag is checked on every call --> tracing can be enabled at runtime
+def traced(name):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, start, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+
+#
+#   true when events reach a sink
+#   guard for event arguments that are expensive to build
+def listening():
+    return len(sinks) > 0
+
+
+#
+#   debug message, formatted by the sinks only
+#   message: str.format pattern, args: raw values
+def event(message, *args):
+    if len(sinks) == 0:
+        return
+    for sink in sinks:
+        sink((message, args))
+
+
+#
+#   add / remove sink
+#   sink: callable getting SpanRecord or (message, args) event tuples
+def addSink(sink):
+    if sink not in sinks:
+        sinks.append(sink)
+
+
+def removeSink(sink):
+    if sink in sinks:
+        sinks.remove(sink)
+
+
+#
+#   sink printing spans and events to stdout
+#
+def printSink(item):
+    if isinstance(item, SpanRecord):
+        text = "trace {} {:.1f} us".format(item.name, item.duration/1e3)
+        if item.info is not None:
+            text = text + " " + str(item.info)
+        print(text)
+    else:
+        print(item[0].format(*item[1]))
+
+
+#
+#   recorded spans, oldest first
+#   name: only spans with this name
+def records(name=None):
+    return [r for r in buffer if name is None or r.name == name]
+
+
+#
+#   per span name: (count, total ns, maximum ns) of the recorded spans
+#
+def summary():
+    result = {}
+    for r in buffer:
+        count, total, maximum = result.get(r.name, (0, 0, 0))
+        result[r.name] = (count + 1, total + r.duration, max(maximum, r.duration))
+    return result
+
+
+#
+#   drop all recorded spans
+#
+def clear():
+    buffer.clear()
+
+
+# print sink enabled from the constants
+if logic.Constants.TRACE_PRINT:
+    addSink(printSink)
@@ -1,11 +1,36 @@
-import platform
+from logic.Constants import *
 from logic.Config import *
 from logic.DividerCalc import *
+from logic.FreqMath import *
 from logic.RegisterMap import *
 from logic.SetRegister import *
-from logic.Constants import *
+from logic.PlanCache import *
 from logic.Status import *
 
-if ("arm" in platform.machine()):
-    from logic.GPIOControl import *
-    from logic.SpiConnection import *
+#
+#   Command line tools (python3 -m logic.X) are no package members:
+#   BatchCalc, Benchmark, BitWidth, PlanDatabase, PlanResults, Sweep, plan
+#   import them as module (import logic.Sweep as Sweep)
+#
+
+# class --> defining module, imported on first use (see __getattr__)
+LAZY_CLASSES = {
+    "GPIOControl": "logic.GPIOControl",
+    "Connection": "logic.SpiConnection",
+    "StatusMonitor": "logic.StatusMonitor",
+    "DeviceService": "logic.DeviceService",
+}
+
+
+#
+#   Raspberry only hardware classes (GPIO + SPI) and the device service
+#   imported on first use --> headless tools (logic.plan, ...) run without
+#   the RPi.GPIO / smbus / spidev packages, the stand-alone test code of the
+#   modules runs without a second import (runpy)
+def __getattr__(name):
+    if name in LAZY_CLASSES:
+        import importlib
+        value = getattr(importlib.import_module(LAZY_CLASSES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module 'logic' has no attribute '{}'".format(name))
@@ -0,0 +1,209 @@
+import logic
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+#
+#   Headless batch planning
+#   Reads one plan specification per line (JSONL) from stdin or a file,
+#   runs calcDivider + setRegister + buildTransferList on a process pool and
+#   streams one result per line (same order as the input)
+#   No PyQt5 and no Raspberry hardware module is imported
+#
+#   python3 -m logic.plan [specs.jsonl] [--workers N] [--output FILE]
+#
+#   specification:
+#   {"id": "board 1",
+#    "channels": [100e6, {"frequency": 25e6, "signal": "LVDS", "stop": "STOP LOW", "impedance": 0}, null],
+#    "inputs": [10e6, {"frequency": 25e6, "format": "STANDARD"}],
+#    "vddo": "1.8 V"}
+#   channels / inputs: index = position, number --> enabled with defaults,
+#   null --> disabled
+#
+#   result:
+#   {"id": ..., "fvco": ..., "Fpfd": ..., "MN": ..., "MD": ..., "Mxaxb_N": ..., "Mxaxb_D": ...,
+#    "channels": [{"index", "frequency", "NN", "ND", "R", "N", "realFrequency"}, ...],
+#    "inputs": [{"index", "PN", "PD"}, ...], "register": [[address, value], ...]}
+#   or {"id": ..., "error": "..."} for an invalid specification
+#
+
+
+# output channels of the Si5394
+CHANNELS = 4
+
+# output formats with the CMOS frequency limit
+CMOS_TYPES = (logic.SignalType.LVCMOS_INPHASE, logic.SignalType.LVCMOS_COMPL)
+
+
+#
+#   enum member by value ("LVDS") or name ("LVCMOS_INPHASE")
+#
+def enumValue(enum, text, default):
+    if text is None:
+        return default
+    for member in enum:
+        if text == member.value or text == member.name:
+            return member
+    raise ValueError("unknown {} '{}'".format(enum.__name__, text))
+
+
+#
+#   frequency within the limits of the frequency pickers, else ValueError
+#   (0 / negative / nan frequencies fail in the divider calculation)
+def checkFrequency(name, frequency, min, max):
+    if not (min <= frequency <= max):
+        raise ValueError("{} frequency {} Hz not in {} ... {} Hz".format(name, frequency, min, max))
+
+
+#
+#   configuration of a specification
+#
+def specConfiguration(spec):
+    channels = []
+    specChannels = spec.get("channels", [])
+    if len(specChannels) > CHANNELS:
+        raise ValueError("maximum {} channels".format(CHANNELS))
+    for index in range(CHANNELS):
+        ch = specChannels[index] if index < len(specChannels) else None
+        if ch is None:
+            channels.append(logic.OutChannel(index))
+            continue
+        if not isinstance(ch, dict):
+            ch = {"frequency": ch}
+        signal = logic.SignalFormat(
+            enumValue(logic.SignalType, ch.get("signal"), logic.SignalType.LVDS),
+            enumValue(logic.DisabledState, ch.get("stop"), logic.DisabledState.STOP_LOW),
+            int(ch.get("impedance", 0)))
+        channel = logic.OutChannel(index, float(ch["frequency"]), bool(ch.get("enabled", True)), signal)
+        if channel.enabled:
+            checkFrequency("channel {}".format(index), channel.frequency, logic.Constants.OUTPUT_F_MIN,
+                           logic.Constants.OUTPUT_F_MAX_CMOS if signal.type in CMOS_TYPES else logic.Constants.OUTPUT_F_MAX_DIFF)
+        channels.append(channel)
+
+    inputs = []
+    specInputs = spec.get("inputs", [])
+    if len(specInputs) > len(logic.Constants.IN_NAMES):
+        raise ValueError("maximum {} inputs".format(len(logic.Constants.IN_NAMES)))
+    for index in range(len(logic.Constants.IN_NAMES)):
+        i = specInputs[index] if index < len(specInputs) else None
+        if i is None:
+            inputs.append(logic.Input(index))
+            continue
+        if not isinstance(i, dict):
+            i = {"frequency": i}
+        input = logic.Input(index, float(i["frequency"]), enumValue(logic.InputFormat, i.get("format"), logic.InputFormat.STANDARD))
+        input.enabled = bool(i.get("enabled", True))
+        if input.enabled:
+            checkFrequency("input {}".format(index), input.frequency, logic.Constants.INPUT_F_MIN,
+                           logic.Constants.INPUT_F_MAX_DIFF if input.format == logic.InputFormat.STANDARD else logic.Constants.INPUT_F_MAX_CMOS)
+        inputs.append(input)
+
+    conf = logic.Configuration(channels, inputs)
+    conf.vddo = enumValue(logic.SignalVoltage, spec.get("vddo"), logic.SignalVoltage.V1P8)
+    return conf
+
+
+#
+#   solve one specification (runs in pool process)
+#   returns the result dictionary
+def planSpec(spec):
+    id = spec.get("id") if isinstance(spec, dict) else None
+    try:
+        conf = specConfiguration(spec)
+        if not conf.hasActiveChannel():
+            raise ValueError("no enabled channel")
+        conf = logic.calcDivider(conf)
+        conf = logic.setRegister(conf)
+        register = conf.regMap.buildTransferList()
+    except (ValueError, KeyError, TypeError, AttributeError, ArithmeticError) as e:
+        return {"id": id, "error": str(e)}
+
+    return {
+        "id": id,
+        "fvco": conf.fvco,
+        "Fpfd": conf.Fpfd,
+        "MN": conf.MN,
+        "MD": conf.MD,
+        "Mxaxb_N": conf.Mxaxb_N,
+        "Mxaxb_D": conf.Mxaxb_D,
+        "channels": [{"index": ch.index, "frequency": ch.frequency, "NN": int(ch.NN), "ND": int(ch.ND),
+                      "R": int(ch.R), "N": ch.N, "realFrequency": ch.realFrequency}
+                     for ch in conf.channels if ch.enabled],
+        "inputs": [{"index": i.index, "PN": int(i.PN), "PD": int(i.PD)} for i in conf.inputs if i.enabled],
+        "register": [[address, value] for address, value in register]
+    }
+
+
+#
+#   specifications of the JSONL lines, invalid lines --> error entry
+#
+def readSpecs(lines):
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line == "":
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield {"id": "line {}".format(number), "invalidJson": str(e)}
+
+
+#
+#   solve the specifications, yields results in input order
+#   at most "window" specifications are in flight --> constant memory
+#   workers: process count, 1 --> no process pool
+def planAll(specs, workers=None, window=None):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if window is None:
+        window = workers * 4
+
+    if workers <= 1:
+        for spec in specs:
+            yield invalidResult(spec) or planSpec(spec)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for spec in specs:
+            result = invalidResult(spec)
+            pending.append(pool.submit(dict, result) if result else pool.submit(planSpec, spec))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+#
+#   error result for an unreadable line, None for a valid specification
+#
+def invalidResult(spec):
+    if isinstance(spec, dict) and "invalidJson" in spec:
+        return {"id": spec["id"], "error": "invalid json: " + spec["invalidJson"]}
+    if not isinstance(spec, dict):
+        return {"id": None, "error": "specification must be an object"}
+    return None
+
+
+#
+#   command line interface
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless batch planning: JSONL specifications --> plans + register bytes")
+    parser.add_argument("input", nargs="?", default=None, help="JSONL specification file, default stdin")
+    parser.add_argument("--output", default=None, help="JSONL result file, default stdout")
+    parser.add_argument("--workers", type=int, default=None, help="process count, 1 --> no process pool")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input is None else open(args.input)
+    target = sys.stdout if args.output is None else open(args.output, "w")
+    for result in planAll(readSpecs(source), args.workers):
+        target.write(json.dumps(result) + "\n")
+        target.flush()
+    if args.input is not None:
+        source.close()
+    if args.output is not None:
+        target.close()